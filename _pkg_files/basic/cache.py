@@ -0,0 +1,447 @@
+"""
+Memoization with pluggable caches.
+
+:class:`MemoryCache` is a bounded in-process LRU cache with an optional TTL,
+:class:`DiskCache` is a persistent SQLite backed cache that can be shared by
+multiple processes, and :class:`TieredCache` combines caches so that hits in
+slower tiers are promoted to faster ones.
+
+.. code-block:: python
+
+    @memoize(TieredCache([MemoryCache(), DiskCache(default_cache_dir() / "cache.db")]))
+    def compute(value: int) -> int:
+        ...
+
+Keys are made by hashing the pickled arguments, so arguments should pickle
+the same way in every process for disk cache hits across processes.
+"""
+import abc
+import functools
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple, TypeVar, cast
+
+import structlog
+from structlog.types import FilteringBoundLogger
+
+logger: FilteringBoundLogger = structlog.get_logger(__name__)
+
+FuncT = TypeVar("FuncT", bound=Callable[..., Any])
+
+MISSING: Any = object()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class Cache(abc.ABC):
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+
+    def get(self, key: str) -> Any:
+        """
+        Returns the value for ``key`` or ``MISSING`` if there is none.
+        """
+        value = self._get(key)
+        if value is MISSING:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    @abc.abstractmethod
+    def _get(self, key: str) -> Any:
+        ...
+
+    @abc.abstractmethod
+    def set(self, key: str, value: Any) -> None:
+        ...
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        ...
+
+
+class MemoryCache(Cache):
+    """
+    A thread safe LRU cache holding at most ``max_entries`` entries, each of
+    which expires ``ttl`` seconds after it was set if ``ttl`` is not None.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            expires, value = entry
+            if expires is not None and expires <= self._clock():
+                del self._entries[key]
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        expires = None if self.ttl is None else self._clock() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskCache(Cache):
+    """
+    A persistent cache in an SQLite database at ``path``.
+
+    Values are pickled, and once the total size of pickled values exceeds
+    ``max_size`` bytes the least recently used entries are evicted. The total
+    is kept in a metadata row that is updated in the same transaction as the
+    entries. The database uses write-ahead logging and immediate transactions
+    for writes so that multiple threads and processes can use the same file.
+
+    Hits do not write to the database. Their access times are buffered and
+    written in one transaction once ``access_batch_size`` hits are pending or
+    ``access_flush_interval`` seconds have passed, and before every write.
+    Entries that were only hit by another process since its last flush may
+    therefore be evicted slightly early.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_size: int = 256 * 1024 * 1024,
+        ttl: Optional[float] = None,
+        timeout: float = 30.0,
+        access_batch_size: int = 256,
+        access_flush_interval: float = 1.0,
+    ) -> None:
+        super().__init__()
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self.timeout = timeout
+        self.access_batch_size = access_batch_size
+        self.access_flush_interval = access_flush_interval
+        self._local = threading.local()
+        self._accessed: Dict[str, float] = {}
+        self._accessed_lock = threading.Lock()
+        self._accessed_flushed = time.monotonic()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._transaction() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY,"
+                " value BLOB NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " expires REAL,"
+                " accessed REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS metadata ("
+                " key TEXT PRIMARY KEY,"
+                " value INTEGER NOT NULL)"
+            )
+            connection.execute(
+                "INSERT OR IGNORE INTO metadata (key, value)"
+                " SELECT 'size', COALESCE(SUM(size), 0) FROM entries"
+            )
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        # Connections are per thread and are not reused in forked children.
+        connection: Optional[sqlite3.Connection] = getattr(
+            self._local, "connection", None
+        )
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(
+                str(self.path), timeout=self.timeout, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _transaction(self) -> "_Transaction":
+        return _Transaction(self._connection)
+
+    def __len__(self) -> int:
+        row = self._connection.execute("SELECT COUNT(*) FROM entries").fetchone()
+        return int(row[0])
+
+    def size(self) -> int:
+        row = self._connection.execute(
+            "SELECT value FROM metadata WHERE key = 'size'"
+        ).fetchone()
+        return int(row[0])
+
+    def _get(self, key: str) -> Any:
+        now = time.time()
+        row = self._connection.execute(
+            "SELECT value, expires FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return MISSING
+        value, expires = row
+        if expires is not None and expires <= now:
+            # Another process may have set a fresh value since the read, which
+            # the condition on expires keeps.
+            with self._transaction() as connection:
+                removed = self._delete(connection, key, expired_before=now)
+                if removed:
+                    self._add_size(connection, -removed)
+            return MISSING
+        with self._accessed_lock:
+            self._accessed[key] = now
+            flush = (
+                len(self._accessed) >= self.access_batch_size
+                or time.monotonic() - self._accessed_flushed
+                >= self.access_flush_interval
+            )
+        if flush:
+            self.flush()
+        # The database is only written by this cache.
+        return pickle.loads(value)  # noqa: S301
+
+    def flush(self) -> None:
+        """
+        Writes the buffered access times of hits to the database.
+        """
+        with self._transaction() as connection:
+            self._flush_accessed(connection)
+
+    def _flush_accessed(self, connection: sqlite3.Connection) -> None:
+        with self._accessed_lock:
+            accessed = self._accessed
+            self._accessed = {}
+            self._accessed_flushed = time.monotonic()
+        if accessed:
+            connection.executemany(
+                "UPDATE entries SET accessed = ? WHERE key = ?",
+                [(value, key) for key, value in accessed.items()],
+            )
+
+    def _add_size(self, connection: sqlite3.Connection, delta: int) -> int:
+        connection.execute(
+            "UPDATE metadata SET value = value + ? WHERE key = 'size'", (delta,)
+        )
+        row = connection.execute(
+            "SELECT value FROM metadata WHERE key = 'size'"
+        ).fetchone()
+        return int(row[0])
+
+    def _delete(
+        self,
+        connection: sqlite3.Connection,
+        key: str,
+        expired_before: Optional[float] = None,
+    ) -> int:
+        """
+        Deletes the entry for ``key``, only if it expired at or before
+        ``expired_before`` if that is not None, and returns the size removed.
+        """
+        condition = "key = ?"
+        parameters: Tuple[Any, ...] = (key,)
+        if expired_before is not None:
+            condition += " AND expires IS NOT NULL AND expires <= ?"
+            parameters += (expired_before,)
+        row = connection.execute(
+            f"SELECT size FROM entries WHERE {condition}", parameters  # noqa: S608
+        ).fetchone()
+        if row is None:
+            return 0
+        cursor = connection.execute(
+            f"DELETE FROM entries WHERE {condition}", parameters  # noqa: S608
+        )
+        return int(row[0]) if cursor.rowcount else 0
+
+    def set(self, key: str, value: Any) -> None:
+        now = time.time()
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        expires = None if self.ttl is None else now + self.ttl
+        with self._transaction() as connection:
+            self._flush_accessed(connection)
+            replaced = self._delete(connection, key)
+            connection.execute(
+                "INSERT INTO entries (key, value, size, expires, accessed)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data), expires, now),
+            )
+            total = self._add_size(connection, len(data) - replaced)
+            if total > self.max_size:
+                self._evict(connection, total)
+
+    def _evict(self, connection: sqlite3.Connection, total: int) -> None:
+        now = time.time()
+        expired_count, expired_size = connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            " WHERE expires IS NOT NULL AND expires <= ?",
+            (now,),
+        ).fetchone()
+        connection.execute(
+            "DELETE FROM entries WHERE expires IS NOT NULL AND expires <= ?", (now,)
+        )
+        total -= expired_size
+        evicted = expired_count
+        cursor = connection.execute("SELECT key, size FROM entries ORDER BY accessed")
+        keys = []
+        for key, size in cursor:
+            if total <= self.max_size:
+                break
+            keys.append((key,))
+            total -= size
+        cursor.close()
+        connection.executemany("DELETE FROM entries WHERE key = ?", keys)
+        evicted += len(keys)
+        connection.execute("UPDATE metadata SET value = ? WHERE key = 'size'", (total,))
+        logger.debug("evicted", count=evicted, path=f"{self.path}")
+
+    def delete(self, key: str) -> None:
+        with self._transaction() as connection:
+            self._add_size(connection, -self._delete(connection, key))
+
+    def clear(self) -> None:
+        with self._accessed_lock:
+            self._accessed.clear()
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM entries")
+            connection.execute("UPDATE metadata SET value = 0 WHERE key = 'size'")
+
+    def close(self) -> None:
+        connection: Optional[sqlite3.Connection] = getattr(
+            self._local, "connection", None
+        )
+        if connection is not None:
+            self.flush()
+            connection.close()
+            self._local.connection = None
+
+
+class _Transaction:
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection = connection
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection
+
+    def __exit__(self, exc_type: Any, *exc_info: Any) -> None:
+        if exc_type is None:
+            self.connection.execute("COMMIT")
+        else:
+            self.connection.execute("ROLLBACK")
+
+
+class TieredCache(Cache):
+    """
+    Looks up keys in ``tiers`` in order, and copies values found in a later
+    tier into all earlier tiers.
+    """
+
+    def __init__(self, tiers: Sequence[Cache]) -> None:
+        super().__init__()
+        self.tiers = list(tiers)
+
+    def _get(self, key: str) -> Any:
+        for index, tier in enumerate(self.tiers):
+            value = tier.get(key)
+            if value is not MISSING:
+                for earlier in self.tiers[:index]:
+                    earlier.set(key, value)
+                return value
+        return MISSING
+
+    def set(self, key: str, value: Any) -> None:
+        for tier in self.tiers:
+            tier.set(key, value)
+
+    def delete(self, key: str) -> None:
+        for tier in self.tiers:
+            tier.delete(key)
+
+    def clear(self) -> None:
+        for tier in self.tiers:
+            tier.clear()
+
+
+def make_key(*parts: Any) -> str:
+    data = pickle.dumps(parts, protocol=4)
+    return hashlib.sha256(data).hexdigest()
+
+
+def memoize(cache: Cache) -> Callable[[FuncT], FuncT]:
+    """
+    Decorates a function so that its results are stored in ``cache`` keyed by
+    the function's qualified name and its arguments.
+    """
+
+    def decorator(function: FuncT) -> FuncT:
+        name = f"{function.__module__}.{function.__qualname__}"
+
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = make_key(name, args, sorted(kwargs.items()))
+            value = cache.get(key)
+            if value is MISSING:
+                value = function(*args, **kwargs)
+                cache.set(key, value)
+            return value
+
+        return cast(FuncT, wrapper)
+
+    return decorator
+
+
+def default_cache_dir() -> Path:
+    """
+    Returns the directory for this package's caches, which is under
+    ``XDG_CACHE_HOME`` or ``~/.cache``.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / (__package__ or __name__)
@@ -8,7 +8,10 @@ import structlog
 import typer
 from structlog.types import FilteringBoundLogger, Processor
 
+from .. import timing
 from .._version import __version__
+from .completion import cli_completion
+from .daemon import cli_daemon
 from .sub import cli_sub
 
 logger: FilteringBoundLogger = structlog.get_logger(__name__)
@@ -24,6 +27,8 @@ https://typer.tiangolo.com/tutorial/options/
 
 cli = typer.Typer(pretty_exceptions_enable=False)
 cli.add_typer(cli_sub, name="sub")
+cli.add_typer(cli_completion, name="completion")
+cli.add_typer(cli_daemon, name="daemon")
 
 
 @cli.callback()
@@ -57,11 +62,15 @@ def cli_version(ctx: typer.Context) -> None:
 
 def main() -> None:
     setup_logging()
-    cli()
+    timing.configure_from_env()
+    try:
+        cli()
+    finally:
+        timing.report()
 
 
 def setup_logging(console: bool = False) -> None:
-    shared_processors: List[Processor] = []
+    shared_processors: List[Processor] = [timing.add_span_info]
     structlog.configure(
         processors=shared_processors
         + [
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Static shell completion scripts.
+
+The scripts are generated from the click command tree and complete commands,
+options and choice values without running the program. The ``path`` command
+writes the script to the package cache directory, and rewrites it whenever
+the fingerprint of the command tree, the package version or the script
+format changes, so shells can source it with:
+
+.. code-block:: bash
+
+    source "$(cli-name completion path --shell bash)"
+"""
+import enum
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import click
+import structlog
+import typer
+from structlog.types import FilteringBoundLogger
+
+from .._version import __version__
+from ..cache import default_cache_dir
+
+logger: FilteringBoundLogger = structlog.get_logger(__name__)
+
+"""
+https://click.palletsprojects.com/en/8.1.x/shell-completion/
+https://www.gnu.org/software/bash/manual/html_node/Programmable-Completion.html
+https://fishshell.com/docs/current/completions.html
+"""
+
+
+class Shell(str, enum.Enum):
+    BASH = "bash"
+    ZSH = "zsh"
+    FISH = "fish"
+
+
+Tree = Dict[str, Any]
+
+FINGERPRINT_PREFIX = "# fingerprint: "
+# Increment when the output of the renderers changes so that cached scripts
+# are rewritten.
+SCRIPT_FORMAT_VERSION = 1
+
+
+def command_tree(command: click.Command, ctx: click.Context) -> Tree:
+    """
+    Returns the options and subcommands of ``command`` as a JSON serializable
+    tree.
+    """
+    options: List[Dict[str, Any]] = []
+    help_option = command.get_help_option(ctx)
+    for param in [*command.params, *([help_option] if help_option else [])]:
+        if not isinstance(param, click.Option) or param.hidden:
+            continue
+        options.append(
+            {
+                "opts": [*param.opts, *param.secondary_opts],
+                "takes_value": not (param.is_flag or param.count),
+                "choices": (
+                    list(param.type.choices)
+                    if isinstance(param.type, click.Choice)
+                    else None
+                ),
+            }
+        )
+    commands: Dict[str, Tree] = {}
+    if isinstance(command, click.Group):
+        for name in command.list_commands(ctx):
+            subcommand = command.get_command(ctx, name)
+            if subcommand is None or subcommand.hidden:
+                continue
+            sub_ctx = click.Context(subcommand, parent=ctx, info_name=name)
+            commands[name] = command_tree(subcommand, sub_ctx)
+    return {"options": options, "commands": commands}
+
+
+def fingerprint(tree: Tree) -> str:
+    data = json.dumps([SCRIPT_FORMAT_VERSION, __version__, tree], sort_keys=True)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _walk(tree: Tree, path: Tuple[str, ...] = ()) -> List[Tuple[Tuple[str, ...], Tree]]:
+    result = [(path, tree)]
+    for name, subtree in tree["commands"].items():
+        result.extend(_walk(subtree, (*path, name)))
+    return result
+
+
+def bash_function_name(prog: str) -> str:
+    return "_{}_static_completion".format(re.sub(r"\W", "_", prog))
+
+
+def render_bash(prog: str, tree: Tree) -> str:
+    function = bash_function_name(prog)
+    transitions: List[str] = []
+    words: List[str] = []
+    values: List[str] = []
+    for path, node in _walk(tree):
+        key = " ".join(path)
+        for name in node["commands"]:
+            next_key = " ".join((*path, name))
+            transitions.append(f'            "{key}:{name}") path="{next_key}" ;;')
+        candidates = [opt for option in node["options"] for opt in option["opts"]]
+        candidates.extend(node["commands"])
+        words.append(f'            "{key}") words="{" ".join(candidates)}" ;;')
+        for option in node["options"]:
+            if not option["takes_value"]:
+                continue
+            choices = " ".join(option["choices"] or [])
+            for opt in option["opts"]:
+                values.append(f'            "{key}:{opt}") words="{choices}" ;;')
+    lines = [
+        f"{function}() {{",
+        '    local cur="${COMP_WORDS[COMP_CWORD]}"',
+        '    local prev="${COMP_WORDS[COMP_CWORD-1]}"',
+        '    local path="" words="" i',
+        "    for ((i = 1; i < COMP_CWORD; i++)); do",
+        '        case "${path}:${COMP_WORDS[i]}" in',
+        *transitions,
+        "        esac",
+        "    done",
+        "    if [[ ${COMP_CWORD} -gt 1 ]]; then",
+        '        case "${path}:${prev}" in',
+        *values,
+        '            *) prev="" ;;',
+        "        esac",
+        "    else",
+        '        prev=""',
+        "    fi",
+        '    if [[ -z "${prev}" ]]; then',
+        '        case "${path}" in',
+        *words,
+        "        esac",
+        "    fi",
+        '    COMPREPLY=($(compgen -W "${words}" -- "${cur}"))',
+        "}",
+        f"complete -o default -F {function} {prog}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def render_zsh(prog: str, tree: Tree) -> str:
+    return "autoload -U +X bashcompinit && bashcompinit\n" + render_bash(prog, tree)
+
+
+def render_fish(prog: str, tree: Tree) -> str:
+    lines: List[str] = []
+    for path, node in _walk(tree):
+        conditions = (
+            [f"__fish_seen_subcommand_from {path[-1]}"]
+            if path
+            else ["__fish_use_subcommand"]
+        )
+        if path and node["commands"]:
+            conditions.append(
+                "not __fish_seen_subcommand_from " + " ".join(node["commands"])
+            )
+        condition = "; and ".join(conditions)
+        for name in node["commands"]:
+            lines.append(f"complete -c {prog} -f -n '{condition}' -a {name}")
+        for option in node["options"]:
+            flags = []
+            for opt in option["opts"]:
+                if opt.startswith("--"):
+                    flags.append(f"-l {opt[2:]}")
+                elif len(opt) == 2:
+                    flags.append(f"-s {opt[1:]}")
+                else:
+                    flags.append(f"-o {opt[1:]}")
+            if option["takes_value"]:
+                flags.append("-r")
+                if option["choices"]:
+                    flags.append("-f -a '{}'".format(" ".join(option["choices"])))
+            lines.append(f"complete -c {prog} -n '{condition}' {' '.join(flags)}")
+    return "\n".join(lines) + "\n"
+
+
+RENDERERS = {
+    Shell.BASH: render_bash,
+    Shell.ZSH: render_zsh,
+    Shell.FISH: render_fish,
+}
+
+
+def render(prog: str, tree: Tree, shell: Shell) -> str:
+    return f"{FINGERPRINT_PREFIX}{fingerprint(tree)}\n" + RENDERERS[shell](prog, tree)
+
+
+def script_path(prog: str, shell: Shell) -> Path:
+    return default_cache_dir() / "completion" / f"{prog}.{shell.value}"
+
+
+def ensure_script(path: Path, prog: str, tree: Tree, shell: Shell) -> bool:
+    """
+    Writes the completion script to ``path`` unless it is already there with
+    the same fingerprint, and returns whether it was written.
+    """
+    expected = f"{FINGERPRINT_PREFIX}{fingerprint(tree)}"
+    if path.exists():
+        with path.open("r") as io:
+            if io.readline().rstrip("\n") == expected:
+                return False
+    logger.debug("writing completion script", path=f"{path}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(render(prog, tree, shell))
+    return True
+
+
+def _root(ctx: typer.Context) -> Tuple[str, Tree]:
+    root = ctx.find_root()
+    assert root.info_name is not None
+    return root.info_name, command_tree(root.command, root)
+
+
+cli_completion = typer.Typer()
+
+
+@cli_completion.command("script")
+def cli_completion_script(
+    ctx: typer.Context,
+    shell: Shell = typer.Option(Shell.BASH, "--shell", "-s"),
+) -> None:
+    """
+    Print the static completion script.
+    """
+    prog, tree = _root(ctx)
+    typer.echo(render(prog, tree, shell), nl=False)
+
+
+@cli_completion.command("path")
+def cli_completion_path(
+    ctx: typer.Context,
+    shell: Shell = typer.Option(Shell.BASH, "--shell", "-s"),
+    path: Optional[Path] = typer.Option(None, "--path", "-p"),
+) -> None:
+    """
+    Update the cached static completion script if needed and print its path.
+    """
+    prog, tree = _root(ctx)
+    path = path or script_path(prog, shell)
+    ensure_script(path, prog, tree, shell)
+    typer.echo(f"{path}")
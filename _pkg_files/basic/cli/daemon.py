@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+import typer
+
+from .. import daemon
+
+cli_daemon = typer.Typer(help="Run the CLI in a warm interpreter.")
+
+
+@cli_daemon.command("serve")
+def cli_daemon_serve() -> None:
+    """
+    Run the daemon in the foreground.
+    """
+    daemon.serve()
+
+
+@cli_daemon.command("start")
+def cli_daemon_start() -> None:
+    """
+    Start the daemon in the background if it is not running and print its
+    process ID.
+    """
+    typer.echo(f"{daemon.start()}")
+
+
+@cli_daemon.command("stop")
+def cli_daemon_stop() -> None:
+    """
+    Stop the daemon and print its process ID.
+    """
+    pid = daemon.stop()
+    if pid is None:
+        typer.echo("daemon is not running", err=True)
+        raise typer.Exit(1)
+    typer.echo(f"{pid}")
+
+
+@cli_daemon.command("status")
+def cli_daemon_status() -> None:
+    """
+    Print the process ID and socket of the daemon.
+    """
+    response = daemon.request(daemon.socket_path(), {"op": "ping"})
+    if response is None:
+        typer.echo("daemon is not running", err=True)
+        raise typer.Exit(1)
+    typer.echo(f"{response['pid']} {daemon.socket_path()}")
@@ -1,10 +1,15 @@
 #!/usr/bin/env python3
+import sys
 from typing import List, Optional
 
 import structlog
 import typer
 from structlog.types import FilteringBoundLogger
 
+from .. import timing
+from ..functions import sum_numbers
+from ..streams import iter_input_records
+
 logger: FilteringBoundLogger = structlog.get_logger(__name__)
 
 """
@@ -33,9 +38,20 @@ def cli_sub_leaf(
     ctx: typer.Context,
     name: Optional[str] = typer.Option("fake", "--name", "-n", help="The name ..."),
     numbers: Optional[List[int]] = typer.Argument(None),
+    input_name: Optional[str] = typer.Option(
+        None,
+        "--input",
+        "-i",
+        metavar="FILE|-",
+        help="Sum the numbers in FILE, or in standard input if FILE is - ...",
+    ),
 ) -> None:
-    logger.debug(
-        "entry",
-        ctx_parent_params=({} if ctx.parent is None else ctx.parent.params),
-        ctx_params=ctx.params,
-    )
+    with timing.span("cli.sub.leaf"):
+        logger.debug(
+            "entry",
+            ctx_parent_params=({} if ctx.parent is None else ctx.parent.params),
+            ctx_params=ctx.params,
+        )
+        if input_name is not None:
+            count, total = sum_numbers(iter_input_records(input_name))
+            sys.stdout.write(f"{count} {total}\n")
@@ -1,2 +1,23 @@
+from typing import Iterable, Tuple
+
+from .timing import timed
+
+
+@timed()
 def package_function() -> str:
     return "value"
+
+
+@timed()
+def sum_numbers(records: Iterable[bytes]) -> Tuple[int, int]:
+    """
+    Returns the count and the sum of the integers in ``records``, skipping
+    blank records.
+    """
+    count = 0
+    total = 0
+    for record in records:
+        if record.strip():
+            count += 1
+            total += int(record)
+    return count, total
@@ -0,0 +1,115 @@
+"""
+Constant memory input helpers.
+
+Regular files are read through memory maps, and standard input and other
+files such as pipes are read in fixed size chunks with a bounded buffer, so
+inputs of any size can be processed record by record without reading them
+into memory.
+
+.. code-block:: python
+
+    for record in iter_input_records(name):  # name is a path or "-"
+        ...
+"""
+import mmap
+import os
+import stat
+import sys
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+CHUNK_SIZE = 1024 * 1024
+MAX_RECORD_SIZE = 16 * 1024 * 1024
+# Pages of a memory map that have been read are released every this many
+# bytes so that resident memory does not grow with the size of the file.
+RELEASE_SIZE = 64 * 1024 * 1024
+
+
+def iter_chunks(stream: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Yields ``stream`` in chunks of ``chunk_size`` bytes, the last of which
+    may be shorter.
+    """
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_stream_records(
+    stream: BinaryIO,
+    separator: bytes = b"\n",
+    chunk_size: int = CHUNK_SIZE,
+    max_record_size: int = MAX_RECORD_SIZE,
+) -> Iterator[bytes]:
+    """
+    Yields the records in ``stream`` without their separator. At most one
+    chunk and one partial record are buffered, and :class:`ValueError` is
+    raised for records longer than ``max_record_size``.
+    """
+    pending = b""
+    for chunk in iter_chunks(stream, chunk_size):
+        data = pending + chunk if pending else chunk
+        start = 0
+        while True:
+            end = data.find(separator, start)
+            if end < 0:
+                break
+            yield data[start:end]
+            start = end + len(separator)
+        pending = data[start:]
+        if len(pending) > max_record_size:
+            raise ValueError(f"record longer than {max_record_size} bytes")
+    if pending:
+        yield pending
+
+
+def iter_mmap_records(
+    path: Path,
+    separator: bytes = b"\n",
+    release_size: int = RELEASE_SIZE,
+) -> Iterator[bytes]:
+    """
+    Yields the records in the file at ``path`` without their separator,
+    reading the file through a memory map. Files that are not regular files,
+    such as pipes and character devices, are read as streams instead.
+    """
+    with path.open("rb") as io:
+        status = os.fstat(io.fileno())
+        if not stat.S_ISREG(status.st_mode):
+            yield from iter_stream_records(io, separator)
+            return
+        if status.st_size == 0:
+            return
+        with mmap.mmap(io.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            can_release = hasattr(mapped, "madvise") and hasattr(mmap, "MADV_DONTNEED")
+            size = len(mapped)
+            start = 0
+            released = 0
+            while start < size:
+                end = mapped.find(separator, start)
+                if end < 0:
+                    end = size
+                yield mapped[start:end]
+                start = end + len(separator)
+                if can_release and start - released >= release_size:
+                    # Only whole pages that have been read are released.
+                    length = (start - released) // mmap.PAGESIZE * mmap.PAGESIZE
+                    if length:
+                        mapped.madvise(mmap.MADV_DONTNEED, released, length)
+                        released += length
+
+
+def iter_mmap_lines(path: Path) -> Iterator[bytes]:
+    return iter_mmap_records(path, b"\n")
+
+
+def iter_input_records(name: str, separator: bytes = b"\n") -> Iterator[bytes]:
+    """
+    Yields the records from standard input if ``name`` is ``-``, and from
+    the file at ``name`` otherwise.
+    """
+    if name == "-":
+        return iter_stream_records(sys.stdin.buffer, separator)
+    return iter_mmap_records(Path(name), separator)
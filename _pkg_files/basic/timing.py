@@ -0,0 +1,258 @@
+"""
+Lightweight span timing.
+
+Spans record their duration into in-process histograms which can be written
+out as a summary when the CLI exits. Recording is disabled unless enabled with
+:func:`enable` or the ``PYTHON_SPANS`` environment variable, and when disabled
+a span costs little more than a function call.
+
+Log events emitted inside a span get the span name and elapsed duration bound
+to them by the :func:`add_span_info` processor.
+
+.. code-block:: python
+
+    with span("load"):
+        ...
+
+    @timed()
+    def compute() -> None:
+        ...
+"""
+import contextvars
+import functools
+import json
+import math
+import os
+import sys
+import threading
+import time
+from typing import IO, Any, Callable, Dict, List, Optional, TypeVar, cast
+
+import structlog
+from structlog.types import EventDict, FilteringBoundLogger
+
+logger: FilteringBoundLogger = structlog.get_logger(__name__)
+
+FuncT = TypeVar("FuncT", bound=Callable[..., Any])
+
+SPANS_ENV = "PYTHON_SPANS"
+SPANS_FILE_ENV = "PYTHON_SPANS_FILE"
+OUTPUT_FORMATS = ("text", "json")
+
+# The maximum number of samples kept per histogram for percentiles, once
+# reached the oldest samples are overwritten.
+MAX_SAMPLES = 4096
+
+
+class Histogram:
+    __slots__ = ("count", "total", "min", "max", "_samples")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self._samples: List[float] = []
+
+    def record(self, duration: float) -> None:
+        if len(self._samples) < MAX_SAMPLES:
+            self._samples.append(duration)
+        else:
+            self._samples[self.count % MAX_SAMPLES] = duration
+        self.count += 1
+        self.total += duration
+        if duration < self.min:
+            self.min = duration
+        if duration > self.max:
+            self.max = duration
+
+    def percentile(self, percent: float) -> float:
+        if not self._samples:
+            return 0.0
+        samples = sorted(self._samples)
+        index = max(0, math.ceil(percent / 100 * len(samples)) - 1)
+        return samples[index]
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+        }
+
+
+class Registry:
+    def __init__(self) -> None:
+        self.enabled = False
+        self.output_format = "text"
+        self.histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, duration: float) -> None:
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.record(duration)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                name: histogram.summary()
+                for name, histogram in sorted(self.histograms.items())
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms.clear()
+
+
+REGISTRY = Registry()
+
+
+class Span:
+    __slots__ = ("name", "start", "_token")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.start = 0.0
+        self._token: Optional["contextvars.Token[Optional[Span]]"] = None
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        duration = self.elapsed()
+        if self._token is not None:
+            _current_span.reset(self._token)
+        REGISTRY.record(self.name, duration)
+        logger.debug("span", span=self.name, span_duration=duration)
+
+
+class _NoopSpan(Span):
+    __slots__ = ()
+
+    def elapsed(self) -> float:
+        return 0.0
+
+    def __enter__(self) -> Span:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan("noop")
+
+_current_span: "contextvars.ContextVar[Optional[Span]]" = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def add_span_info(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
+    """
+    A structlog processor that adds the name and elapsed duration of the
+    current span to log events.
+    """
+    current = _current_span.get()
+    if current is not None:
+        event_dict.setdefault("span", current.name)
+        event_dict.setdefault("span_elapsed", current.elapsed())
+    return event_dict
+
+
+def span(name: str) -> Span:
+    """
+    Returns a context manager that records its duration under ``name``.
+    """
+    if not REGISTRY.enabled:
+        return _NOOP_SPAN
+    return Span(name)
+
+
+def timed(name: Optional[str] = None) -> Callable[[FuncT], FuncT]:
+    """
+    Decorates a function so that each call is recorded as a span, by default
+    named after the function's module and qualified name.
+    """
+
+    def decorator(function: FuncT) -> FuncT:
+        span_name = name or f"{function.__module__}.{function.__qualname__}"
+
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not REGISTRY.enabled:
+                return function(*args, **kwargs)
+            with Span(span_name):
+                return function(*args, **kwargs)
+
+        return cast(FuncT, wrapper)
+
+    return decorator
+
+
+def enable(output_format: str = "text") -> None:
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"invalid output format {output_format!r}")
+    REGISTRY.enabled = True
+    REGISTRY.output_format = output_format
+
+
+def disable() -> None:
+    REGISTRY.enabled = False
+
+
+def configure_from_env() -> None:
+    value = os.environ.get(SPANS_ENV)
+    if value is None or value == "false":
+        disable()
+    elif value in OUTPUT_FORMATS:
+        enable(value)
+    else:
+        raise ValueError(
+            f"invalid value for {SPANS_ENV} - must be 'text', 'json' or 'false'"
+        )
+
+
+def write_summary(io: IO[str], output_format: str = "text") -> None:
+    summary = REGISTRY.summary()
+    if output_format == "json":
+        json.dump(summary, io, indent=2)
+        io.write("\n")
+        return
+    io.write(
+        f"{'span':<40} {'count':>8} {'sum':>10} {'p50':>10} {'p90':>10} {'p99':>10}\n"
+    )
+    for name, values in summary.items():
+        io.write(
+            f"{name:<40} {values['count']:>8.0f} {values['sum']:>10.6f}"
+            f" {values['p50']:>10.6f} {values['p90']:>10.6f} {values['p99']:>10.6f}\n"
+        )
+
+
+def report() -> None:
+    """
+    Writes the summary of all recorded spans if recording is enabled, to the
+    file named by ``PYTHON_SPANS_FILE`` or otherwise to stderr.
+    """
+    if not REGISTRY.enabled:
+        return
+    path = os.environ.get(SPANS_FILE_ENV)
+    if path:
+        with open(path, "w") as io:
+            write_summary(io, REGISTRY.output_format)
+    else:
+        write_summary(sys.stderr, REGISTRY.output_format)
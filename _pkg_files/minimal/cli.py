@@ -6,7 +6,10 @@ import sys
 from dataclasses import dataclass, field
 from typing import List
 
+from . import daemon, timing
 from ._version import __version__
+from .functions import sum_numbers
+from .streams import iter_input_records
 
 logger = logging.getLogger(__name__)
 
@@ -31,12 +34,31 @@ class Application:
         )
         parser.set_defaults(handler=self.handle)
         current_parser = parser
-        current_subparsers = current_parser.add_subparsers()
+        current_subparsers_root = current_subparsers = current_parser.add_subparsers()
         current_parser = current_subparsers.add_parser("sub")
         current_subparsers = current_parser.add_subparsers()
         current_parser = current_subparsers.add_parser("leaf")
         current_parser.set_defaults(handler=self.cli_sub_leaf)
         current_parser.add_argument("target", nargs="*", type=str)
+        current_parser.add_argument(
+            "--input",
+            "-i",
+            action="store",
+            dest="input_name",
+            metavar="FILE|-",
+            help="sum the numbers in FILE, or in standard input if FILE is -",
+        )
+        current_parser = current_subparsers_root.add_parser(
+            "daemon", help="run the CLI in a warm interpreter"
+        )
+        current_subparsers = current_parser.add_subparsers()
+        for name, handler in (
+            ("serve", self.cli_daemon_serve),
+            ("start", self.cli_daemon_start),
+            ("stop", self.cli_daemon_stop),
+            ("status", self.cli_daemon_status),
+        ):
+            current_subparsers.add_parser(name).set_defaults(handler=handler)
 
     def run(self, args: List[str]) -> None:
         parse_result = self.parser.parse_args(args)
@@ -66,12 +88,38 @@ class Application:
         logging.debug("entry ...")
 
     def cli_sub_leaf(self, parse_result: argparse.Namespace) -> None:
-        logging.debug("entry ...")
+        with timing.span("cli.sub.leaf"):
+            logging.debug("entry ...")
+            if parse_result.input_name is not None:
+                count, total = sum_numbers(iter_input_records(parse_result.input_name))
+                sys.stdout.write(f"{count} {total}\n")
+
+    def cli_daemon_serve(self, parse_result: argparse.Namespace) -> None:
+        daemon.serve()
+
+    def cli_daemon_start(self, parse_result: argparse.Namespace) -> None:
+        sys.stdout.write(f"{daemon.start()}\n")
+
+    def cli_daemon_stop(self, parse_result: argparse.Namespace) -> None:
+        pid = daemon.stop()
+        if pid is None:
+            sys.exit("daemon is not running")
+        sys.stdout.write(f"{pid}\n")
+
+    def cli_daemon_status(self, parse_result: argparse.Namespace) -> None:
+        response = daemon.request(daemon.socket_path(), {"op": "ping"})
+        if response is None:
+            sys.exit("daemon is not running")
+        sys.stdout.write(f"{response['pid']} {daemon.socket_path()}\n")
 
 
 def main() -> None:
     setup_logging()
-    Application().run(sys.argv[1:])
+    timing.configure_from_env()
+    try:
+        Application().run(sys.argv[1:])
+    finally:
+        timing.report()
 
 
 def setup_logging() -> None:
@@ -0,0 +1,408 @@
+"""
+Warm interpreter daemon.
+
+Every run of the CLI pays for starting the interpreter and importing the
+package and its dependencies. The daemon does this once and then listens on
+a per-user Unix socket. With ``PYTHON_CLI_DAEMON=true`` the entry point
+forwards its arguments, environment, working directory and standard streams
+to the daemon, which runs the CLI in a forked child so that runs do not share
+state, and exits with the child's exit code.
+
+If no daemon is running, or the files of the package have changed since it
+started, the CLI runs in process as usual. Signals are not forwarded to the daemon.
+
+.. code-block:: bash
+
+    cli-name daemon start
+    export PYTHON_CLI_DAEMON=true
+    cli-name sub leaf
+
+This module only imports the standard library so that the client is cheap to
+start.
+"""
+import array
+import io
+import json
+import logging
+import os
+import signal
+import socket
+import stat
+import struct
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ._version import __version__
+
+logger = logging.getLogger(__name__)
+
+ENABLE_ENV = "PYTHON_CLI_DAEMON"
+SOCKET_ENV = "PYTHON_CLI_DAEMON_SOCKET"
+
+PACKAGE_PATH = Path(__file__).parent
+
+HEADER = struct.Struct("!I")
+MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+# Connections are handled one at a time, so a client that does not send its
+# request within this many seconds is dropped instead of blocking the others.
+HANDSHAKE_TIMEOUT = 2.0
+STREAM_FDS = (0, 1, 2)
+
+Message = Dict[str, Any]
+
+
+def enabled() -> bool:
+    value = os.environ.get(ENABLE_ENV, "false")
+    if value not in ("true", "false"):
+        raise ValueError(f"invalid value for {ENABLE_ENV} - must be 'true' or 'false'")
+    return value == "true"
+
+
+def socket_path() -> Path:
+    """
+    Returns ``PYTHON_CLI_DAEMON_SOCKET`` if it is set, and otherwise a path in
+    a directory for this package and user under ``XDG_RUNTIME_DIR`` or the
+    temporary directory.
+    """
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return Path(path)
+    package = __package__ or __name__
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / package / "daemon.sock"
+    temp_dir = os.environ.get("TMPDIR") or "/tmp"  # noqa: S108
+    return Path(temp_dir) / f"{package}-{os.getuid()}" / "daemon.sock"
+
+
+def fingerprint(path: Path = PACKAGE_PATH) -> str:
+    """
+    Returns the paths, modification times and sizes of the Python files of
+    the package under ``path``, which change when it is edited or
+    reinstalled. The daemon only runs the code it imported when it started,
+    so it refuses clients with another fingerprint.
+    """
+    entries: List[str] = []
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames[:] = sorted(name for name in dirnames if name != "__pycache__")
+        for filename in sorted(filenames):
+            if filename.endswith(".py"):
+                file_path = os.path.join(dirpath, filename)
+                status = os.stat(file_path)
+                relative_path = os.path.relpath(file_path, path)
+                entries.append(f"{relative_path} {status.st_mtime_ns} {status.st_size}")
+    return "\n".join(entries)
+
+
+def check_directory(path: Path) -> None:
+    """
+    Raises :class:`PermissionError` unless ``path`` is a directory that is
+    owned by and only accessible to the current user, as clients send their
+    environment to whoever listens on the socket in it.
+    """
+    status = path.stat()
+    if not stat.S_ISDIR(status.st_mode):
+        raise NotADirectoryError(f"{path} is not a directory")
+    if status.st_uid != os.getuid() or status.st_mode & 0o077:
+        raise PermissionError(f"{path} must be owned by and private to this user")
+
+
+def _send(connection: socket.socket, message: Message, fds: Sequence[int] = ()) -> None:
+    data = json.dumps(message).encode("utf-8")
+    header = HEADER.pack(len(data))
+    if fds:
+        ancillary = (socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array("i", fds))
+        connection.sendmsg([header], [ancillary])
+    else:
+        connection.sendall(header)
+    connection.sendall(data)
+
+
+def _recv_exact(connection: socket.socket, size: int) -> bytes:
+    chunks: List[bytes] = []
+    while size > 0:
+        chunk = connection.recv(min(size, 1024 * 1024))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv(connection: socket.socket) -> Tuple[Message, List[int]]:
+    fds = array.array("i")
+    header, ancillary, _, _ = connection.recvmsg(
+        HEADER.size, socket.CMSG_SPACE(len(STREAM_FDS) * fds.itemsize)
+    )
+    for level, kind, data in ancillary:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            fds.frombytes(data[: len(data) - len(data) % fds.itemsize])
+    if not header:
+        raise ConnectionError("connection closed")
+    header += _recv_exact(connection, HEADER.size - len(header))
+    (size,) = HEADER.unpack(header)
+    if size > MAX_MESSAGE_SIZE:
+        raise ValueError(f"message of {size} bytes is too large")
+    message = json.loads(_recv_exact(connection, size))
+    assert isinstance(message, dict)
+    return message, list(fds)
+
+
+def _connect(path: Path) -> socket.socket:
+    check_directory(path.parent)
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(f"{path}")
+    except BaseException:
+        connection.close()
+        raise
+    return connection
+
+
+def request(path: Path, message: Message) -> Optional[Message]:
+    """
+    Sends ``message`` to the daemon at ``path`` and returns its response, or
+    None if no daemon is listening.
+    """
+    try:
+        connection = _connect(path)
+    except OSError:
+        return None
+    with connection:
+        _send(connection, message)
+        response, _ = _recv(connection)
+        return response
+
+
+def forward(args: List[str], path: Optional[Path] = None) -> Optional[int]:
+    """
+    Runs the CLI with ``args`` in the daemon and returns its exit code, or
+    None if the daemon did not accept the run and it should run in process.
+    """
+    try:
+        connection = _connect(path or socket_path())
+    except OSError:
+        return None
+    with connection:
+        try:
+            message = {
+                "op": "run",
+                "version": __version__,
+                "fingerprint": fingerprint(),
+                "argv": [sys.argv[0], *args],
+                "env": dict(os.environ),
+                "cwd": os.getcwd(),
+            }
+            _send(connection, message, STREAM_FDS)
+            response, _ = _recv(connection)
+        except (OSError, ValueError):
+            return None
+        if not response.get("accepted"):
+            return None
+        # The run may have had effects by now, so it must not be retried.
+        try:
+            response, _ = _recv(connection)
+        except (OSError, ValueError) as error:
+            sys.stderr.write(f"daemon failed: {error}\n")
+            return 1
+        return int(response["exit_code"])
+
+
+def _exit_code(code: Any) -> int:
+    # The same as the interpreter does for SystemExit.
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    sys.stderr.write(f"{code}\n")
+    return 1
+
+
+def _reset_logging() -> None:
+    root_logger = logging.getLogger("")
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+    root_logger.setLevel(logging.WARNING)
+
+
+def _run(
+    connection: socket.socket,
+    message: Message,
+    fds: List[int],
+    run: Callable[[], None],
+) -> int:
+    try:
+        for fd, target in zip(fds, STREAM_FDS):
+            os.dup2(fd, target)
+            os.close(fd)
+        os.chdir(message["cwd"])
+    except OSError as error:
+        _send(connection, {"accepted": False, "reason": f"{error}"})
+        return 1
+    os.environ.clear()
+    os.environ.update(message["env"])
+    sys.argv = list(message["argv"])
+    if isinstance(sys.stdout, io.TextIOWrapper):
+        sys.stdout.reconfigure(line_buffering=sys.stdout.isatty())
+    _reset_logging()
+    _send(connection, {"accepted": True})
+    try:
+        run()
+        exit_code = 0
+    except SystemExit as error:
+        exit_code = _exit_code(error.code)
+    except BaseException:
+        traceback.print_exc()
+        exit_code = 1
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except OSError:
+            pass
+    _send(connection, {"exit_code": exit_code})
+    return exit_code
+
+
+def _handle(
+    server: socket.socket,
+    connection: socket.socket,
+    run: Callable[[], None],
+    package_fingerprint: str,
+) -> bool:
+    """
+    Handles one client connection, and returns False if the daemon should
+    stop.
+    """
+    message, fds = _recv(connection)
+    op = message.get("op")
+    if op == "ping":
+        _send(
+            connection,
+            {
+                "pid": os.getpid(),
+                "version": __version__,
+                "fingerprint": package_fingerprint,
+            },
+        )
+    elif op == "stop":
+        _send(connection, {"pid": os.getpid()})
+        return False
+    elif op == "run" and message.get("version") != __version__:
+        _send(connection, {"accepted": False, "reason": "version mismatch"})
+    elif op == "run" and message.get("fingerprint") != package_fingerprint:
+        _send(connection, {"accepted": False, "reason": "package files changed"})
+    elif op == "run" and len(fds) == len(STREAM_FDS):
+        if os.fork() == 0:
+            exit_code = 1
+            try:
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                server.close()
+                connection.settimeout(None)
+                exit_code = _run(connection, message, fds, run)
+            finally:
+                os._exit(exit_code)
+    else:
+        _send(connection, {"accepted": False, "reason": f"invalid request {op!r}"})
+    for fd in fds:
+        os.close(fd)
+    return True
+
+
+def serve(path: Optional[Path] = None) -> None:
+    """
+    Imports the CLI and runs it for clients connecting to the socket at
+    ``path`` until the daemon is stopped.
+    """
+    # Taken before the import so that later changes are always detected.
+    package_fingerprint = fingerprint()
+    from .cli import main as cli_main
+
+    path = path or socket_path()
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    check_directory(path.parent)
+    if request(path, {"op": "ping"}) is not None:
+        raise RuntimeError(f"a daemon is already listening on {path}")
+    if path.exists():
+        path.unlink()
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # Children are not waited for as they report their exit code to clients.
+    previous_handler = signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    try:
+        server.bind(f"{path}")
+        os.chmod(path, 0o600)
+        server.listen(128)
+        logger.info("listening on %s", path)
+        running = True
+        while running:
+            connection, _ = server.accept()
+            connection.settimeout(HANDSHAKE_TIMEOUT)
+            with connection:
+                try:
+                    running = _handle(server, connection, cli_main, package_fingerprint)
+                except (OSError, ValueError):
+                    logger.warning("failed to handle connection", exc_info=True)
+    finally:
+        signal.signal(signal.SIGCHLD, previous_handler)
+        server.close()
+        path.unlink()
+        logger.info("stopped listening on %s", path)
+
+
+def start(path: Optional[Path] = None, timeout: float = 30.0) -> int:
+    """
+    Starts a daemon in the background and returns its process ID once it is
+    listening.
+    """
+    import subprocess
+
+    path = path or socket_path()
+    response = request(path, {"op": "ping"})
+    if response is not None:
+        return int(response["pid"])
+    subprocess.Popen(  # noqa: S603
+        [sys.executable, "-c", f"from {__package__}.daemon import serve; serve()"],
+        env={**os.environ, SOCKET_ENV: f"{path}"},
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        response = request(path, {"op": "ping"})
+        if response is not None:
+            return int(response["pid"])
+        time.sleep(0.01)
+    raise TimeoutError(f"daemon did not start listening on {path}")
+
+
+def stop(path: Optional[Path] = None) -> Optional[int]:
+    """
+    Stops the daemon and returns its process ID, or None if none is running.
+    """
+    response = request(path or socket_path(), {"op": "stop"})
+    return None if response is None else int(response["pid"])
+
+
+def _command(args: List[str]) -> Optional[str]:
+    # The global options take no values, so the command is the first argument
+    # that is not an option.
+    return next((arg for arg in args if not arg.startswith("-")), None)
+
+
+def main() -> None:
+    """
+    The entry point of the CLI, which runs the CLI in the daemon if enabled
+    and available and in process otherwise.
+    """
+    args = sys.argv[1:]
+    if enabled() and _command(args) != "daemon":
+        exit_code = forward(args)
+        if exit_code is not None:
+            sys.exit(exit_code)
+    from .cli import main as cli_main
+
+    cli_main()
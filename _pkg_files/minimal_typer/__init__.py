@@ -1,4 +1,18 @@
+from typing import TYPE_CHECKING, Any
+
 from ._version import __version__
-from .functions import package_function
+
+if TYPE_CHECKING:
+    from .functions import package_function
 
 __all__ = ["__version__", "package_function"]
+
+
+def __getattr__(name: str) -> Any:
+    # Imported on first use so that the daemon client only imports the
+    # standard library.
+    if name == "package_function":
+        from .functions import package_function
+
+        return package_function
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,7 +5,10 @@ import sys
 
 import typer
 
+from .. import timing
 from .._version import __version__
+from .completion import cli_completion
+from .daemon import cli_daemon
 from .sub import cli_sub
 
 logger = logging.getLogger(__name__)
@@ -21,6 +24,8 @@ https://typer.tiangolo.com/tutorial/options/
 
 cli = typer.Typer(pretty_exceptions_enable=False)
 cli.add_typer(cli_sub, name="sub")
+cli.add_typer(cli_completion, name="completion")
+cli.add_typer(cli_daemon, name="daemon")
 
 
 @cli.callback()
@@ -54,7 +59,11 @@ def cli_version(ctx: typer.Context) -> None:
 
 def main() -> None:
     setup_logging()
-    cli()
+    timing.configure_from_env()
+    try:
+        cli()
+    finally:
+        timing.report()
 
 
 def setup_logging() -> None:
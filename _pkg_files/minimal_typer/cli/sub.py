@@ -1,9 +1,14 @@
 #!/usr/bin/env python3
 import logging
+import sys
 from typing import List, Optional
 
 import typer
 
+from .. import timing
+from ..functions import sum_numbers
+from ..streams import iter_input_records
+
 logger = logging.getLogger(__name__)
 
 """
@@ -32,9 +37,20 @@ def cli_sub_leaf(
     ctx: typer.Context,
     name: Optional[str] = typer.Option("fake", "--name", "-n", help="The name ..."),
     numbers: Optional[List[int]] = typer.Argument(None),
+    input_name: Optional[str] = typer.Option(
+        None,
+        "--input",
+        "-i",
+        metavar="FILE|-",
+        help="Sum the numbers in FILE, or in standard input if FILE is - ...",
+    ),
 ) -> None:
-    logger.debug(
-        "entry: ctx_parent_params = %s, ctx_params = %s",
-        ({} if ctx.parent is None else ctx.parent.params),
-        ctx.params,
-    )
+    with timing.span("cli.sub.leaf"):
+        logger.debug(
+            "entry: ctx_parent_params = %s, ctx_params = %s",
+            ({} if ctx.parent is None else ctx.parent.params),
+            ctx.params,
+        )
+        if input_name is not None:
+            count, total = sum_numbers(iter_input_records(input_name))
+            sys.stdout.write(f"{count} {total}\n")
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
+import dataclasses
+import distutils.dep_util
 import distutils.dir_util
 import enum
 import json
@@ -9,9 +12,11 @@ import os
 import os.path
 import subprocess
 import sys
-from dataclasses import dataclass
+import tempfile
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional
 
 import yaml
 
@@ -29,10 +34,10 @@ class Variant(str, enum.Enum):
     MINIMAL_TYPER = "minimal_typer"
 
 
-# class BuildTool(str, enum.Enum):
-#     GNU_MAKE = "gnu-make"
-#     GO_TASK = "go-task"
-#     POE = "poe"
+class BuildTool(str, enum.Enum):
+    GNU_MAKE = "gnu-make"
+    GO_TASK = "go-task"
+    POE = "poe"
 
 
 # BUILD_TOOL_FILES = {
@@ -65,12 +70,91 @@ class CopierAnswers:
         )
 
 
-def apply(copier_conf_json: str) -> None:
-    logger.info("entry: os.cwd() = %s", os.getcwd())
-    logger.debug("SCRIPT_PATH = %s", SCRIPT_PATH.absolute())
-    logger.debug("TEMPLATE_PATH = %s", TEMPLATE_PATH.absolute())
-    logger.debug("copier_conf_json = %s", copier_conf_json)
+REPORT_FORMAT_VERSION = 1
+
+
+@dataclass
+class PhaseEvent:
+    """
+    A phase of the post generation task as recorded in the report.
+
+    ``files`` and ``directories`` count what the phase created, copied or
+    committed, or would have in a dry run, and ``bytes`` is the total size of
+    those files.
+    """
+
+    phase: str
+    start: float
+    end: float = 0.0
+    duration: float = 0.0
+    files: int = 0
+    directories: int = 0
+    bytes: int = 0
+    skipped: bool = False
+
+    def add_file(self, path: Path) -> None:
+        self.files += 1
+        self.bytes += path.lstat().st_size
+
+
+@dataclass
+class Report:
+    """
+    The JSON event log written by ``--report``.
+
+    Fields are only ever added to this format, and ``format_version`` is
+    increased if existing fields change.
+    """
+
+    answers: CopierAnswers
+    dry_run: bool
+    events: List[PhaseEvent] = field(default_factory=list)
+    status: str = "running"
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[PhaseEvent]:
+        event = PhaseEvent(phase=name, start=time.time())
+        started = time.perf_counter()
+        self.events.append(event)
+        try:
+            yield event
+        finally:
+            event.duration = time.perf_counter() - started
+            event.end = event.start + event.duration
+            logger.info(
+                "phase %s: duration = %.3fs, files = %s, directories = %s, "
+                "bytes = %s, skipped = %s",
+                event.phase,
+                event.duration,
+                event.files,
+                event.directories,
+                event.bytes,
+                event.skipped,
+            )
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "format_version": REPORT_FORMAT_VERSION,
+            "status": self.status,
+            "dry_run": self.dry_run,
+            "answers": {
+                "python_package_fqname": self.answers.python_package_fqname,
+                "variant": self.answers.variant.value,
+                "git_init": self.answers.git_init,
+                "git_commit": self.answers.git_commit,
+            },
+            "events": [dataclasses.asdict(event) for event in self.events],
+        }
+
+    def write(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w") as io:
+            json.dump(self.to_json(), io, indent=2)
+            io.write("\n")
 
+
+def load_answers(copier_conf_json: str) -> CopierAnswers:
+    logger.debug("copier_conf_json = %s", copier_conf_json)
     copier_conf = json.loads(copier_conf_json)
     logger.debug("copier_conf = %s", copier_conf)
     assert isinstance(copier_conf, dict)
@@ -80,31 +164,50 @@ def apply(copier_conf_json: str) -> None:
         copier_answers = yaml.safe_load(io)
     logger.debug("copier_answers = %s", copier_answers)
     assert isinstance(copier_answers, dict)
+    return CopierAnswers.from_mapping(copier_answers)
 
-    copier_answers = CopierAnswers.from_mapping(copier_answers)
 
-    cwd_path = Path.cwd()
+def make_namespace(
+    answers: CopierAnswers, cwd_path: Path, event: PhaseEvent, dry_run: bool
+) -> Path:
+    logger.debug("namespace_parts = %s", answers.namespace_parts)
+    namespace_path = cwd_path.joinpath("src", *answers.namespace_parts)
+    missing = []
+    path = namespace_path
+    while path != cwd_path and not path.exists():
+        missing.append(path)
+        path = path.parent
+    event.directories = len(missing)
+    if dry_run:
+        logger.info("would make namespace_path %s", namespace_path)
+    else:
+        logger.debug("will make namespace_path %s", namespace_path)
+        namespace_path.mkdir(parents=True, exist_ok=True)
+    return namespace_path
 
-    pkg_files_path = TEMPLATE_PATH.joinpath("_pkg_files", copier_answers.variant.value)
-    # pkg_files_path = cwd_path.joinpath("pkg_files", copier_answers.variant.value)
-    logger.debug(
-        "cwd_path = %s, pkg_files_path = %r / %r",
-        cwd_path,
-        pkg_files_path,
-        pkg_files_path.absolute(),
-    )
 
-    logger.debug("namespace_parts = %s", copier_answers.namespace_parts)
-    namespace_path = cwd_path.joinpath("src", *copier_answers.namespace_parts)
-    logger.debug("will make namespace_path.parent %s", namespace_path.parent)
-    namespace_path.parent.mkdir(parents=True, exist_ok=True)
-    logger.debug("will make namespace_path %s", namespace_path)
-    namespace_path.mkdir(parents=True, exist_ok=True)
+def copy_pkg_files(
+    answers: CopierAnswers, namespace_path: Path, event: PhaseEvent, dry_run: bool
+) -> Dict[Path, Path]:
+    """
+    Copies the package files of the variant, and returns the targets that are
+    copied, or would be in a dry run, with their sources.
+    """
+    pkg_files_path = TEMPLATE_PATH.joinpath("_pkg_files", answers.variant.value)
     logger.debug(
         "will copytree pkg_files_path %s to namespace_path %s",
-        pkg_files_path,
+        pkg_files_path.absolute(),
         namespace_path,
     )
+    # copy_tree only copies files that are newer than their target.
+    copied: Dict[Path, Path] = {}
+    for dirpath, _, filenames in os.walk(pkg_files_path):
+        for filename in filenames:
+            source_path = Path(dirpath, filename)
+            target_path = namespace_path / source_path.relative_to(pkg_files_path)
+            if distutils.dep_util.newer(str(source_path), str(target_path)):
+                event.add_file(source_path)
+                copied[target_path] = source_path
     distutils.dir_util.copy_tree(
         str(pkg_files_path),
         str(namespace_path),
@@ -113,6 +216,7 @@ def apply(copier_conf_json: str) -> None:
         preserve_symlinks=1,
         update=1,
         verbose=1,
+        dry_run=int(dry_run),
     )
     # logger.debug("will rmtree pkg_files_path %s", pkg_files_path.parent)
     # shutil.rmtree(pkg_files_path.parent)
@@ -123,12 +227,118 @@ def apply(copier_conf_json: str) -> None:
     # for remove_file in remove_files:
     #     logger.info("removing unused build file %s", remove_file)
     #     (cwd_path / remove_file).unlink()
+    return copied
+
+
+def list_commit_files(cwd_path: Path, pending: Iterable[Path] = ()) -> List[Path]:
+    """
+    Lists the files that ``git add .`` would stage in ``cwd_path``, which are
+    the tracked files and the untracked files that are not ignored, as if the
+    ``pending`` files existed too.
+    """
+    with contextlib.ExitStack() as stack:
+        git_dir = cwd_path / ".git"
+        if not git_dir.exists():
+            # A dry run has no repository yet, an empty one applies the same
+            # ignore rules.
+            git_dir = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+            subprocess.run(
+                ["git", "init", "--quiet", "--bare", f"{git_dir}"], check=True
+            )
+        output = subprocess.run(
+            [
+                "git",
+                f"--git-dir={git_dir}",
+                f"--work-tree={cwd_path}",
+                "ls-files",
+                "-z",
+                "--cached",
+                "--others",
+                "--exclude-standard",
+            ],
+            cwd=cwd_path,
+            stdout=subprocess.PIPE,
+            check=True,
+        ).stdout
+        paths = {cwd_path / os.fsdecode(name) for name in output.split(b"\0") if name}
+        missing = [path for path in pending if path not in paths]
+        if missing:
+            # check-ignore exits with 1 if none of the paths are ignored.
+            result = subprocess.run(
+                [
+                    "git",
+                    f"--git-dir={git_dir}",
+                    f"--work-tree={cwd_path}",
+                    "check-ignore",
+                    "--no-index",
+                    "-z",
+                    "--stdin",
+                ],
+                cwd=cwd_path,
+                input=b"".join(
+                    os.fsencode(path.relative_to(cwd_path)) + b"\0" for path in missing
+                ),
+                stdout=subprocess.PIPE,
+            )
+            if result.returncode not in (0, 1):
+                raise subprocess.CalledProcessError(result.returncode, result.args)
+            ignored = {
+                cwd_path / os.fsdecode(name)
+                for name in result.stdout.split(b"\0")
+                if name
+            }
+            paths.update(path for path in missing if path not in ignored)
+    return sorted(paths)
+
+
+def git_commit(
+    cwd_path: Path,
+    event: PhaseEvent,
+    dry_run: bool,
+    pending: Optional[Mapping[Path, Path]] = None,
+) -> None:
+    """
+    Commits the project. ``pending`` maps the files that a dry run did not
+    copy to their sources, which are counted in their place.
+    """
+    pending = pending or {}
+    for path in list_commit_files(cwd_path, pending):
+        event.add_file(pending.get(path, path))
+    if dry_run:
+        logger.info("would git commit %s files", event.files)
+        return
+    subprocess.run(["git", "add", "."])
+    subprocess.run(["git", "commit", "-m", "baseline"])
 
-    if copier_answers.git_init:
-        subprocess.run(["git", "init"])
-        if copier_answers.git_commit:
-            subprocess.run(["git", "add", "."])
-            subprocess.run(["git", "commit", "-m", "baseline"])
+
+def apply(
+    answers: CopierAnswers, report: Optional[Report] = None, dry_run: bool = False
+) -> None:
+    logger.info("entry: os.cwd() = %s, dry_run = %s", os.getcwd(), dry_run)
+    logger.debug("SCRIPT_PATH = %s", SCRIPT_PATH.absolute())
+    logger.debug("TEMPLATE_PATH = %s", TEMPLATE_PATH.absolute())
+    report = report or Report(answers=answers, dry_run=dry_run)
+
+    cwd_path = Path.cwd()
+
+    with report.phase("mkdir") as event:
+        namespace_path = make_namespace(answers, cwd_path, event, dry_run)
+
+    with report.phase("copy") as event:
+        copied = copy_pkg_files(answers, namespace_path, event, dry_run)
+
+    with report.phase("git_init") as event:
+        event.skipped = not answers.git_init
+        if answers.git_init:
+            if dry_run:
+                logger.info("would git init %s", cwd_path)
+            else:
+                subprocess.run(["git", "init"])
+
+    with report.phase("git_commit") as event:
+        event.skipped = not (answers.git_init and answers.git_commit)
+        if not event.skipped:
+            git_commit(cwd_path, event, dry_run, copied if dry_run else None)
 
 
 def main() -> None:
@@ -141,6 +351,23 @@ def main() -> None:
         help="the copier config as a JSON object",
         required=True,
     )
+    parser.add_argument(
+        "--report",
+        action="store",
+        type=Path,
+        dest="report",
+        default=os.environ.get("TASK_POST_GENERATION_REPORT") or None,
+        help=(
+            "write a JSON report of the phases to this path, "
+            "defaults to $TASK_POST_GENERATION_REPORT"
+        ),
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        dest="dry_run",
+        help="report what would be done without changing anything",
+    )
     parse_result = parser.parse_args(sys.argv[1:])
     logging.basicConfig(
         level=os.environ.get("PYTHON_LOGGING_LEVEL", logging.INFO),
@@ -151,7 +378,17 @@ def main() -> None:
             "%(name)-12s %(module)s:%(lineno)s:%(funcName)s %(message)s"
         ),
     )
-    apply(parse_result.copier_conf)
+    answers = load_answers(parse_result.copier_conf)
+    report = Report(answers=answers, dry_run=parse_result.dry_run)
+    try:
+        apply(answers, report, parse_result.dry_run)
+        report.status = "ok"
+    except BaseException:
+        report.status = "failed"
+        raise
+    finally:
+        if parse_result.report is not None:
+            report.write(Path(parse_result.report))
 
 
 if __name__ == "__main__":
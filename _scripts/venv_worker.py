@@ -0,0 +1,228 @@
+"""
+A long-lived command worker that runs inside the virtual environment of a
+generated project.
+
+The worker reads one JSON request per line from stdin and writes one JSON
+response per line to stdout. Each ``run`` request is executed in a forked
+child so that modules imported by the worker (or preloaded on request) are
+already warm, while every command still gets a clean process state. Output
+from the child is captured and returned as part of the response.
+
+This script only uses the standard library as it runs with whatever
+interpreter the generated project uses.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib
+import json
+import logging
+import os
+import runpy
+import sys
+import tempfile
+import time
+import traceback
+from dataclasses import asdict, dataclass, field
+from typing import IO, Any, Callable, Dict, List, Mapping, Optional
+
+logger = logging.getLogger(
+    __name__ if __name__ != "__main__" else "scripts.venv_worker"
+)
+
+
+@dataclass
+class WorkerRequest:
+    op: str
+    id: int = 0
+    kind: str = "entry_point"
+    name: str = ""
+    args: List[str] = field(default_factory=list)
+    cwd: Optional[str] = None
+    env: Optional[Dict[str, str]] = None
+    modules: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_mapping(cls, values: Mapping[str, Any]) -> WorkerRequest:
+        return cls(
+            op=values["op"],
+            id=values.get("id", 0),
+            kind=values.get("kind", "entry_point"),
+            name=values.get("name", ""),
+            args=list(values.get("args", [])),
+            cwd=values.get("cwd"),
+            env=values.get("env"),
+            modules=list(values.get("modules", [])),
+        )
+
+
+@dataclass
+class WorkerResponse:
+    id: int
+    returncode: int
+    stdout: str = ""
+    stderr: str = ""
+    duration: float = 0.0
+    error: Optional[str] = None
+
+
+def load_entry_point(name: str) -> Callable[[], Any]:
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # pragma: no cover
+        from importlib_metadata import entry_points  # type: ignore[no-redef]
+
+    eps = entry_points()
+    if hasattr(eps, "select"):
+        candidates = list(eps.select(group="console_scripts", name=name))
+    else:  # pragma: no cover
+        candidates = [ep for ep in eps.get("console_scripts", []) if ep.name == name]
+    if not candidates:
+        raise LookupError(f"no console_scripts entry point named {name!r}")
+    function = candidates[0].load()
+    assert callable(function)
+    return function  # type: ignore[no-any-return]
+
+
+def exit_code(value: Any) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, int):
+        return value
+    sys.stderr.write(f"{value}\n")
+    return 1
+
+
+def execute(request: WorkerRequest) -> int:
+    """
+    Runs the command described by ``request`` in the current process and
+    returns its exit code. This is only ever called in a forked child.
+    """
+    if request.cwd is not None:
+        os.chdir(request.cwd)
+    if request.env is not None:
+        os.environ.clear()
+        os.environ.update(request.env)
+    sys.argv = [request.name, *request.args]
+    try:
+        if request.kind == "entry_point":
+            return exit_code(load_entry_point(request.name)())
+        elif request.kind == "module":
+            runpy.run_module(request.name, run_name="__main__", alter_sys=True)
+            return 0
+        else:
+            raise ValueError(f"invalid kind {request.kind!r}")
+    except SystemExit as error:
+        return exit_code(error.code)
+    except BaseException:
+        traceback.print_exc()
+        return 1
+
+
+def reset_logging() -> None:
+    """
+    Puts the root logger back into the state of a fresh interpreter, so that
+    commands run in forked children do not log through the worker's handlers.
+    """
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+    root_logger.setLevel(logging.WARNING)
+
+
+def run_forked(request: WorkerRequest) -> WorkerResponse:
+    started = time.perf_counter()
+    with tempfile.TemporaryFile() as stdout_io, tempfile.TemporaryFile() as stderr_io:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:  # child
+            returncode = 1
+            try:
+                null_fd = os.open(os.devnull, os.O_RDONLY)
+                os.dup2(null_fd, 0)
+                os.dup2(stdout_io.fileno(), 1)
+                os.dup2(stderr_io.fileno(), 2)
+                reset_logging()
+                returncode = execute(request)
+            finally:
+                with contextlib.suppress(Exception):
+                    sys.stdout.flush()
+                    sys.stderr.flush()
+                os._exit(returncode & 0xFF)
+        _, status = os.waitpid(pid, 0)
+        if os.WIFSIGNALED(status):
+            returncode = -os.WTERMSIG(status)
+        else:
+            returncode = os.WEXITSTATUS(status)
+        stdout_io.seek(0)
+        stderr_io.seek(0)
+        return WorkerResponse(
+            id=request.id,
+            returncode=returncode,
+            stdout=stdout_io.read().decode("utf-8", errors="replace"),
+            stderr=stderr_io.read().decode("utf-8", errors="replace"),
+            duration=time.perf_counter() - started,
+        )
+
+
+def preload(request: WorkerRequest) -> WorkerResponse:
+    started = time.perf_counter()
+    failures: List[str] = []
+    for module in request.modules:
+        try:
+            importlib.import_module(module)
+        except Exception as error:
+            logger.debug("could not preload %s: %s", module, error)
+            failures.append(f"{module}: {error}")
+    return WorkerResponse(
+        id=request.id,
+        returncode=0,
+        stderr="\n".join(failures),
+        duration=time.perf_counter() - started,
+    )
+
+
+def serve(input_io: IO[str], output_io: IO[str]) -> None:
+    for line in input_io:
+        if not line.strip():
+            continue
+        request = WorkerRequest.from_mapping(json.loads(line))
+        logger.debug("request = %s", request)
+        if request.op == "shutdown":
+            break
+        try:
+            if request.op == "run":
+                response = run_forked(request)
+            elif request.op == "preload":
+                response = preload(request)
+            else:
+                raise ValueError(f"invalid op {request.op!r}")
+        except Exception as error:
+            response = WorkerResponse(id=request.id, returncode=-1, error=f"{error}")
+        output_io.write(json.dumps(asdict(response)) + "\n")
+        output_io.flush()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(add_help=True)
+    parser.parse_args(sys.argv[1:])
+    logging.basicConfig(
+        level=os.environ.get("PYTHON_LOGGING_LEVEL", logging.INFO),
+        stream=sys.stderr,
+        datefmt="%Y-%m-%dT%H:%M:%S",
+        format=(
+            "%(asctime)s.%(msecs)03d %(process)d %(thread)d %(levelno)03d:%(levelname)-8s "
+            "%(name)-12s %(module)s:%(lineno)s:%(funcName)s %(message)s"
+        ),
+    )
+    # The protocol uses the original stdout, anything else that writes to
+    # stdout in this process ends up on stderr instead.
+    output_io = os.fdopen(os.dup(1), "w")
+    os.dup2(2, 1)
+    serve(sys.stdin, output_io)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Generator
+
+import pytest
+
+TESTS_PATH = Path(__file__).parent
+PROJECT_PATH = TESTS_PATH.parent
+
+
+def get_worker_id() -> str:
+    """
+    Returns the pytest-xdist worker ID, or ``main`` when tests are not
+    distributed.
+    """
+    return os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+
+@pytest.fixture(scope="session")
+def var_path() -> Path:
+    """
+    A directory under ``var/tests`` that is only used by this worker and
+    that is emptied at the start of every session.
+    """
+    path = PROJECT_PATH / "var" / "tests" / get_worker_id()
+    shutil.rmtree(path, ignore_errors=True)
+    path.mkdir(parents=True)
+    return path
+
+
+@pytest.fixture(scope="session", autouse=True)
+def isolate_worker(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> Generator[None, None, None]:
+    """
+    Points temporary files and caches at directories that are only used by
+    this worker.
+    """
+    temp_path = tmp_path_factory.mktemp(f"worker-{get_worker_id()}")
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("TMPDIR", f"{temp_path}")
+        monkeypatch.setattr(tempfile, "tempdir", f"{temp_path}")
+        monkeypatch.setenv("XDG_CACHE_HOME", f"{temp_path / 'cache'}")
+        yield
@@ -0,0 +1,212 @@
+import logging
+import multiprocessing
+import pickle
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+
+from {{python_package_fqname}}.cache import (
+    MISSING,
+    DiskCache,
+    MemoryCache,
+    TieredCache,
+    make_key,
+    memoize,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_memory_cache_lru() -> None:
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+    assert (cache.stats.hits, cache.stats.misses) == (3, 1)
+
+
+def test_memory_cache_ttl() -> None:
+    clock = FakeClock()
+    cache = MemoryCache(ttl=10, clock=clock)
+    cache.set("a", None)
+    clock.now = 9
+    assert cache.get("a") is None
+    clock.now = 10
+    assert cache.get("a") is MISSING
+
+
+def test_disk_cache_persists(tmp_path: Path) -> None:
+    path = tmp_path / "cache.db"
+    cache = DiskCache(path)
+    cache.set("a", {"value": [1, 2, 3]})
+    cache.close()
+    cache = DiskCache(path)
+    assert cache.get("a") == {"value": [1, 2, 3]}
+    assert cache.get("b") is MISSING
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+    cache.delete("a")
+    assert len(cache) == 0
+
+
+def test_disk_cache_evicts_by_size(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path / "cache.db", max_size=10_000)
+    for index in range(10):
+        cache.set(f"{index}", b"x" * 2_000)
+        time.sleep(0.001)
+    assert cache.size() <= 10_000
+    assert cache.get("0") is MISSING
+    assert cache.get("9") == b"x" * 2_000
+
+
+def test_disk_cache_tracks_size(tmp_path: Path) -> None:
+    path = tmp_path / "cache.db"
+    cache = DiskCache(path)
+
+    def stored_size() -> int:
+        with sqlite3.connect(str(path)) as connection:
+            row = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries")
+            return int(row.fetchone()[0])
+
+    cache.set("a", b"x" * 100)
+    cache.set("a", b"x" * 10)
+    cache.set("b", b"x" * 1_000)
+    assert cache.size() == stored_size() > 1_000
+    cache.delete("a")
+    cache.delete("missing")
+    assert cache.size() == stored_size()
+    cache.close()
+    assert DiskCache(path).size() == stored_size()
+    cache.clear()
+    assert cache.size() == stored_size() == 0
+
+
+def test_disk_cache_keeps_fresh_value(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    An expired entry that another process replaces between the read and the
+    delete of a get is kept.
+    """
+    path = tmp_path / "cache.db"
+    expiring = DiskCache(path, ttl=0.0)
+    other = DiskCache(path)
+    expiring.set("a", b"x" * 10)
+    transaction = expiring._transaction
+
+    def replace_then_transaction() -> Any:
+        other.set("a", b"x" * 100)
+        return transaction()
+
+    monkeypatch.setattr(expiring, "_transaction", replace_then_transaction)
+    assert expiring.get("a") is MISSING
+    assert other.get("a") == b"x" * 100
+    assert other.size() == len(pickle.dumps(b"x" * 100, pickle.HIGHEST_PROTOCOL))
+
+
+def test_disk_cache_batches_accesses(tmp_path: Path) -> None:
+    path = tmp_path / "cache.db"
+    cache = DiskCache(path, access_batch_size=1_000, access_flush_interval=3_600)
+
+    def accessed(key: str) -> float:
+        with sqlite3.connect(str(path)) as connection:
+            row = connection.execute(
+                "SELECT accessed FROM entries WHERE key = ?", (key,)
+            )
+            return float(row.fetchone()[0])
+
+    cache.set("a", b"x" * 2_000)
+    time.sleep(0.001)
+    cache.set("b", b"x" * 2_000)
+    time.sleep(0.001)
+    before = accessed("a")
+    assert cache.get("a") == b"x" * 2_000
+    assert accessed("a") == before
+    # Buffered hits are written before the eviction in set.
+    cache.max_size = 5_000
+    cache.set("c", b"x" * 2_000)
+    assert accessed("a") > before
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == b"x" * 2_000
+
+
+def _write_entries(path: Path, worker: int) -> None:
+    cache = DiskCache(path)
+    for index in range(50):
+        cache.set(f"{worker}-{index}", index)
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="requires fork"
+)
+def test_disk_cache_multiple_processes(tmp_path: Path) -> None:
+    path = tmp_path / "cache.db"
+    DiskCache(path)
+    context = multiprocessing.get_context("fork")
+    processes = [
+        context.Process(target=_write_entries, args=(path, worker))
+        for worker in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+    cache = DiskCache(path)
+    assert len(cache) == 200
+    assert cache.get("3-49") == 49
+
+
+def test_memoize_tiered(tmp_path: Path) -> None:
+    calls: List[int] = []
+    memory = MemoryCache()
+    disk = DiskCache(tmp_path / "cache.db")
+
+    @memoize(TieredCache([memory, disk]))
+    def square(value: int) -> int:
+        calls.append(value)
+        return value * value
+
+    assert [square(2), square(2), square(value=2)] == [4, 4, 4]
+    assert calls == [2, 2]
+    memory.clear()
+    assert square(2) == 4
+    assert calls == [2, 2]
+    assert disk.stats.hits == 1
+
+
+def test_benchmark(tmp_path: Path) -> None:
+    """
+    Compares set and hit times of the memory and disk tiers.
+    """
+    number = 1_000
+    for cache in (MemoryCache(max_entries=number), DiskCache(tmp_path / "cache.db")):
+        keys = [make_key(index) for index in range(number)]
+        started = time.perf_counter()
+        for key in keys:
+            cache.set(key, key)
+        set_time = time.perf_counter() - started
+        started = time.perf_counter()
+        for key in keys:
+            assert cache.get(key) == key
+        get_time = time.perf_counter() - started
+        logging.info(
+            "%s per call: set = %.1fus, get = %.1fus",
+            type(cache).__name__,
+            set_time / number * 1e6,
+            get_time / number * 1e6,
+        )
+        assert cache.stats.hits == number
@@ -0,0 +1,161 @@
+import logging
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Generator, List, Optional
+
+import pytest
+
+from {{python_package_fqname}} import daemon
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX") or not hasattr(os, "fork"),
+    reason="requires Unix sockets and fork",
+)
+
+# Runs the CLI through the same entry point as the installed script.
+RUN_CLI = "from {{ python_package_fqname }}.daemon import main; main()"
+RUNS = 20
+
+
+def run(
+    args: List[str],
+    env: Dict[str, str],
+    cwd: Optional[Path] = None,
+    input: Optional[str] = None,
+    check: bool = False,
+) -> "subprocess.CompletedProcess[str]":
+    return subprocess.run(
+        [sys.executable, "-c", RUN_CLI, *args],
+        env=env,
+        cwd=cwd,
+        input=input,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=check,
+    )
+
+
+@pytest.fixture
+def socket_path(tmp_path: Path) -> Path:
+    path = tmp_path / "daemon"
+    path.mkdir(mode=0o700)
+    return path / "daemon.sock"
+
+
+@pytest.fixture
+def daemon_env(socket_path: Path) -> Generator[Dict[str, str], None, None]:
+    env = {
+        **os.environ,
+        daemon.ENABLE_ENV: "true",
+        daemon.SOCKET_ENV: f"{socket_path}",
+    }
+    pid = daemon.start(socket_path)
+    try:
+        yield env
+    finally:
+        assert daemon.stop(socket_path) == pid
+
+
+def test_forward(daemon_env: Dict[str, str], tmp_path: Path) -> None:
+    (tmp_path / "input.txt").write_text("1\n2\n3\n")
+    env = {**daemon_env, "PYTHON_SPANS": "text"}
+    result = run(["sub", "leaf", "--input", "input.txt"], env, cwd=tmp_path)
+    assert (result.returncode, result.stdout) == (0, "3 6\n")
+    assert "cli.sub.leaf" in result.stderr
+    result = run(["sub", "leaf", "--input", "-"], daemon_env, input="4\n5\n")
+    assert (result.returncode, result.stdout) == (0, "2 9\n")
+    result = run(["sub", "leaf", "--no-such-option"], daemon_env)
+    assert result.returncode == 2
+
+
+def test_fallback(socket_path: Path) -> None:
+    env = {
+        **os.environ,
+        daemon.ENABLE_ENV: "true",
+        daemon.SOCKET_ENV: f"{socket_path}",
+    }
+    assert daemon.forward(["sub", "leaf"], socket_path) is None
+    result = run(["sub", "leaf", "--input", "-"], env, input="1\n")
+    assert (result.returncode, result.stdout) == (0, "1 1\n")
+
+
+def test_fingerprint(tmp_path: Path) -> None:
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "__pycache__").mkdir()
+    for name in ("a.py", "sub/b.py", "__pycache__/c.py", "d.txt"):
+        (tmp_path / name).write_text("")
+    fingerprint = daemon.fingerprint(tmp_path)
+    assert [line.split()[0] for line in fingerprint.splitlines()] == [
+        "a.py",
+        os.path.join("sub", "b.py"),
+    ]
+    os.utime(tmp_path / "sub" / "b.py", ns=(0, 0))
+    assert daemon.fingerprint(tmp_path) != fingerprint
+
+
+def test_changed_package(
+    daemon_env: Dict[str, str], socket_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    response = daemon.request(socket_path, {"op": "ping"})
+    assert response is not None
+    assert response["fingerprint"] == daemon.fingerprint()
+    # As if a file of the package was edited after the daemon started.
+    monkeypatch.setattr(daemon, "fingerprint", lambda: "changed")
+    assert daemon.forward(["sub", "leaf"], socket_path) is None
+
+
+def test_stalled_client(daemon_env: Dict[str, str], socket_path: Path) -> None:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stalled:
+        stalled.connect(f"{socket_path}")
+        started = time.monotonic()
+        response = daemon.request(socket_path, {"op": "ping"})
+        assert response is not None
+        assert time.monotonic() - started < daemon.HANDSHAKE_TIMEOUT * 5
+
+
+@pytest.mark.parametrize(
+    "args, command",
+    [
+        ([], None),
+        (["daemon", "serve"], "daemon"),
+        (["-v", "daemon", "serve"], "daemon"),
+        (["--verbose", "-v", "sub", "leaf", "--name", "daemon"], "sub"),
+    ],
+)
+def test_command(args: List[str], command: Optional[str]) -> None:
+    assert daemon._command(args) == command
+
+
+def test_private_directory(tmp_path: Path) -> None:
+    tmp_path.chmod(0o755)
+    with pytest.raises(PermissionError):
+        daemon.check_directory(tmp_path)
+    assert daemon.forward(["sub", "leaf"], tmp_path / "daemon.sock") is None
+
+
+def measure(args: List[str], env: Dict[str, str]) -> float:
+    run(args, env, check=True)
+    started = time.perf_counter()
+    for _ in range(RUNS):
+        run(args, env, check=True)
+    return (time.perf_counter() - started) / RUNS
+
+
+@pytest.mark.benchmark
+def test_benchmark(daemon_env: Dict[str, str]) -> None:
+    """
+    Compares the per call latency of the daemon against a cold start.
+    """
+    args = ["sub", "leaf"]
+    daemon_time = measure(args, daemon_env)
+    cold_time = measure(args, {**daemon_env, daemon.ENABLE_ENV: "false"})
+    logging.info(
+        "per call: daemon = %.1fms, cold start = %.1fms",
+        daemon_time * 1e3,
+        cold_time * 1e3,
+    )
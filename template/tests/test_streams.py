@@ -0,0 +1,151 @@
+import io
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from {{python_package_fqname}}.functions import sum_numbers
+from {{python_package_fqname}}.streams import (
+    iter_chunks,
+    iter_input_records,
+    iter_mmap_lines,
+    iter_mmap_records,
+    iter_stream_records,
+)
+
+# Set STREAMS_BENCHMARK_BYTES to benchmark with larger inputs, e.g. 4294967296.
+BENCHMARK_BYTES = int(os.environ.get("STREAMS_BENCHMARK_BYTES", 16 * 1024 * 1024))
+BENCHMARK_LINE = b"123456789\n"
+
+# Runs the CLI with the given arguments and writes the peak resident set size
+# of the process to the given path when it exits.
+RUN_CLI = """
+import json, resource, sys
+from {{ python_package_fqname }}.cli import main
+rusage_path, sys.argv = sys.argv[1], sys.argv[1:]
+try:
+    main()
+finally:
+    with open(rusage_path, "w") as io:
+        json.dump(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, io)
+"""
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        (b"", []),
+        (b"\n", [b""]),
+        (b"a", [b"a"]),
+        (b"a\nbb\n", [b"a", b"bb"]),
+        (b"a\nbb\nccc", [b"a", b"bb", b"ccc"]),
+        (b"a\n\nccc\n", [b"a", b"", b"ccc"]),
+    ],
+)
+def test_records(tmp_path: Path, content: bytes, expected: List[bytes]) -> None:
+    path = tmp_path / "input.txt"
+    path.write_bytes(content)
+    assert list(iter_mmap_lines(path)) == expected
+    assert list(iter_mmap_records(path, release_size=1)) == expected
+    assert list(iter_stream_records(io.BytesIO(content), chunk_size=2)) == expected
+
+
+def test_separator(tmp_path: Path) -> None:
+    path = tmp_path / "input.bin"
+    path.write_bytes(b"a\r\nb\r\n")
+    assert list(iter_mmap_records(path, b"\r\n")) == [b"a", b"b"]
+    assert list(iter_stream_records(io.BytesIO(path.read_bytes()), b"\r\n", 1)) == [
+        b"a",
+        b"b",
+    ]
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="requires named pipes")
+def test_fifo(tmp_path: Path) -> None:
+    """
+    Pipes have no size, so they are read as streams and not memory mapped.
+    """
+    path = tmp_path / "input.fifo"
+    os.mkfifo(path)
+
+    def write() -> None:
+        with path.open("wb") as io:
+            io.write(b"1\n2\n3\n")
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        assert list(iter_input_records(f"{path}")) == [b"1", b"2", b"3"]
+    finally:
+        writer.join()
+
+
+def test_chunks() -> None:
+    assert list(iter_chunks(io.BytesIO(b"abcde"), 2)) == [b"ab", b"cd", b"e"]
+
+
+def test_max_record_size() -> None:
+    records = iter_stream_records(
+        io.BytesIO(b"a\n" + b"b" * 10), chunk_size=4, max_record_size=8
+    )
+    assert next(records) == b"a"
+    with pytest.raises(ValueError):
+        next(records)
+
+
+def test_sum_numbers() -> None:
+    assert sum_numbers([b"1", b"", b" 2 ", b"-4"]) == (3, -1)
+
+
+def write_benchmark_input(path: Path) -> int:
+    block = BENCHMARK_LINE * (1024 * 1024 // len(BENCHMARK_LINE))
+    blocks = max(1, BENCHMARK_BYTES // len(block))
+    with path.open("wb") as io:
+        for _ in range(blocks):
+            io.write(block)
+    return blocks * block.count(b"\n")
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("source", ["file", "stdin"])
+def test_benchmark(tmp_path: Path, source: str) -> None:
+    """
+    Measures throughput and peak resident memory of ``sub leaf --input``.
+    """
+    input_path = tmp_path / "input.txt"
+    rusage_path = tmp_path / "rusage.json"
+    count = write_benchmark_input(input_path)
+    size = input_path.stat().st_size
+    args = [sys.executable, "-c", RUN_CLI, f"{rusage_path}", "sub", "leaf"]
+    started = time.perf_counter()
+    with input_path.open("rb") as stdin:
+        result = subprocess.run(
+            [*args, "--input", "-" if source == "stdin" else f"{input_path}"],
+            stdin=stdin,
+            stdout=subprocess.PIPE,
+            check=True,
+        )
+    elapsed = time.perf_counter() - started
+    assert result.stdout.split() == [
+        f"{count}".encode(),
+        f"{count * int(BENCHMARK_LINE)}".encode(),
+    ]
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+    max_rss = json.loads(rusage_path.read_text())
+    max_rss *= 1 if sys.platform == "darwin" else 1024
+    logging.info(
+        "%s: %.1f MiB at %.1f MiB/s, peak RSS = %.1f MiB",
+        source,
+        size / 2**20,
+        size / 2**20 / elapsed,
+        max_rss / 2**20,
+    )
+    if size >= 1024 * 1024 * 1024:
+        assert max_rss < size / 4
@@ -0,0 +1,119 @@
+import io
+import json
+import logging
+import timeit
+from typing import Generator
+
+import pytest
+
+from {{python_package_fqname}} import package_function, timing
+
+
+@pytest.fixture
+def spans_enabled() -> Generator[None, None, None]:
+    timing.REGISTRY.reset()
+    timing.enable()
+    yield
+    timing.disable()
+    timing.REGISTRY.reset()
+
+
+@pytest.mark.usefixtures("spans_enabled")
+def test_span_records() -> None:
+    for _ in range(3):
+        with timing.span("outer"):
+            with timing.span("inner") as inner:
+                assert timing.current_span() is inner
+            package_function()
+    assert timing.current_span() is None
+    summary = timing.REGISTRY.summary()
+    assert summary["outer"]["count"] == 3
+    assert summary["inner"]["count"] == 3
+    assert summary["outer"]["sum"] >= summary["inner"]["sum"]
+    assert summary["{{python_package_fqname}}.functions.package_function"]["count"] == 3
+
+
+@pytest.mark.usefixtures("spans_enabled")
+def test_write_summary_json() -> None:
+    with timing.span("something"):
+        pass
+    output = io.StringIO()
+    timing.write_summary(output, "json")
+    summary = json.loads(output.getvalue())
+    assert set(summary["something"]) == {
+        "count",
+        "sum",
+        "min",
+        "max",
+        "p50",
+        "p90",
+        "p99",
+    }
+
+
+def test_disabled_records_nothing() -> None:
+    timing.REGISTRY.reset()
+    with timing.span("something"):
+        assert timing.current_span() is None
+    assert package_function() == "value"
+    assert timing.REGISTRY.summary() == {}
+
+
+def test_histogram_percentiles() -> None:
+    histogram = timing.Histogram()
+    for value in range(1, 101):
+        histogram.record(float(value))
+    summary = histogram.summary()
+    assert summary["count"] == 100
+    assert summary["min"] == 1.0
+    assert summary["max"] == 100.0
+    assert summary["p50"] == 50.0
+    assert summary["p99"] == 99.0
+
+
+@pytest.mark.benchmark
+def test_overhead() -> None:
+    """
+    Compares the per call cost of spans with recording disabled and enabled
+    against an empty ``with`` statement.
+    """
+    number = 10_000
+    timing.REGISTRY.reset()
+
+    class Empty:
+        def __enter__(self) -> None:
+            pass
+
+        def __exit__(self, *exc_info: object) -> None:
+            pass
+
+    empty = Empty()
+
+    def with_empty() -> None:
+        with empty:
+            pass
+
+    baseline = min(timeit.repeat(with_empty, number=number, repeat=3))
+
+    def with_span() -> None:
+        with timing.span("overhead"):
+            pass
+
+    disabled = min(timeit.repeat(with_span, number=number, repeat=3))
+    timing.enable()
+    try:
+        enabled = min(timeit.repeat(with_span, number=number, repeat=3))
+    finally:
+        timing.disable()
+        timing.REGISTRY.reset()
+    logging.info(
+        "per call: baseline = %.1fns, disabled = %.1fns, enabled = %.1fns",
+        baseline / number * 1e9,
+        disabled / number * 1e9,
+        enabled / number * 1e9,
+    )
+    assert disabled < enabled
+    # A disabled span is a function call returning a shared no-op context
+    # manager. It costs about 1.2 times an empty with statement, and about 2.6
+    # times under coverage tracing, so this leaves room for noisy machines.
+    assert disabled < baseline * 5
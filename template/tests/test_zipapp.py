@@ -0,0 +1,75 @@
+import logging
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pytest
+
+PROJECT_PATH = Path(__file__).parent.parent
+ZIPAPP_PATH = PROJECT_PATH / "var" / "zipapp" / "{{ cli_name }}.pyz"
+ENTRY_POINT_PATH = Path(sys.executable).parent / "{{ cli_name }}"
+VERSION_ARGS = {{ '["--version"]' if variant == "minimal" else '["version"]' }}
+RUNS = 10
+
+
+def run(
+    args: List[str], input: Optional[str] = None
+) -> "subprocess.CompletedProcess[str]":
+    return subprocess.run(
+        args,
+        input=input,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+
+
+def outputs(args: List[str], input: Optional[str]) -> Tuple[str, str]:
+    """
+    Returns the standard output and error of a run with the program name of
+    the zipapp replaced by that of the entry point, which usage and version
+    messages include.
+    """
+    result = run(args, input)
+    return (
+        result.stdout.replace(ZIPAPP_PATH.name, ENTRY_POINT_PATH.name),
+        result.stderr.replace(ZIPAPP_PATH.name, ENTRY_POINT_PATH.name),
+    )
+
+
+def measure(args: List[str], input: Optional[str]) -> float:
+    run(args, input)
+    started = time.perf_counter()
+    for _ in range(RUNS):
+        run(args, input)
+    return (time.perf_counter() - started) / RUNS
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(
+    not ZIPAPP_PATH.exists(), reason="zipapp is not built, run the zipapp target"
+)
+@pytest.mark.parametrize(
+    "args, input",
+    [(VERSION_ARGS, None), (["sub", "leaf", "--input", "-"], "1\n2\n3\n")],
+)
+def test_zipapp_startup(args: List[str], input: Optional[str]) -> None:
+    """
+    Compares the startup time of the zipapp against the venv entry point.
+    """
+    zipapp = [sys.executable, f"{ZIPAPP_PATH}", *args]
+    entry_point = [f"{ENTRY_POINT_PATH}", *args]
+    expected = outputs(entry_point, input)
+    assert any(expected)
+    assert outputs(zipapp, input) == expected
+    zipapp_time = measure(zipapp, input)
+    entry_point_time = measure(entry_point, input)
+    logging.info(
+        "%s: zipapp = %.1fms, entry point = %.1fms",
+        " ".join(args),
+        zipapp_time * 1e3,
+        entry_point_time * 1e3,
+    )
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import contextlib
+import difflib
 import enum
 import hashlib
 import itertools
@@ -7,12 +9,30 @@ import json
 import logging
 import os
 import pickle
+import re
+import select
+import signal
+import stat
 import subprocess
+import sys
 import tempfile
+import time
 from dataclasses import dataclass
-from pathlib import Path
-from shutil import rmtree
-from typing import Any, Callable, Dict, Generator, Mapping, Set, Tuple, TypeVar
+from pathlib import Path, PurePosixPath
+from shutil import copy2, copytree, ignore_patterns, rmtree, which
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
 
 import pytest
 import yaml
@@ -72,6 +92,28 @@ AnyT = TypeVar("AnyT")
 TEST_RAPID = json.loads(os.environ.get("TEST_RAPID", "true"))
 assert isinstance(TEST_RAPID, bool)
 
+# When enabled workflow actions are sent to a long-lived worker running in the
+# venv of the generated project instead of starting a new ``bash -c`` for each
+# of them.
+TEST_WORKER = json.loads(os.environ.get("TEST_WORKER", "false"))
+assert isinstance(TEST_WORKER, bool)
+
+# When enabled test_copied_cmd only runs for cases where the render manifest
+# differs in dependency relevant files from the manifest that the case last
+# passed with.
+TEST_TIERED = json.loads(os.environ.get("TEST_TIERED", "false"))
+assert isinstance(TEST_TIERED, bool)
+
+# When enabled configured projects are keyed by their rendered dependency
+# relevant files and other changes are overlaid onto an existing project.
+TEST_INCREMENTAL = json.loads(os.environ.get("TEST_INCREMENTAL", "false"))
+assert isinstance(TEST_INCREMENTAL, bool)
+
+# When enabled test_render_manifest writes golden manifests instead of
+# comparing against them.
+TEST_UPDATE_GOLDEN = json.loads(os.environ.get("TEST_UPDATE_GOLDEN", "false"))
+assert isinstance(TEST_UPDATE_GOLDEN, bool)
+
 
 def hash_path(
     root: Path,
@@ -116,10 +158,18 @@ ESCAPED_ENV = escape_venv(os.environ)
 
 
 class Copier:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        base_path: Optional[Path] = None,
+        incremental: bool = TEST_INCREMENTAL,
+    ) -> None:
         self._copied: Dict[CopyKey, CopyResult] = {}
+        self.base_path = Path(tempfile.gettempdir()) if base_path is None else base_path
+        self.incremental = incremental
 
     def copy(self, template_path: Path, data: Dict[str, Any]) -> CopyResult:
+        if self.incremental:
+            return self._copy_incremental(template_path, data)
         if TEST_RAPID:
             template_path_hash = hash_object(template_path)
         else:
@@ -144,7 +194,7 @@ class Copier:
         if key in self._copied:
             return self._copied[key]
 
-        output_path = Path(tempfile.gettempdir()) / f"copied-{key_hash}" / "project"
+        output_path = self.base_path / f"copied-{key_hash}" / "project"
         output_answers_path = output_path.parent / f"{output_path.name}-answers.json"
         logging.info(
             "output_path = %s, output_answers_path = %s",
@@ -173,6 +223,7 @@ class Copier:
             return copied
 
         output_path.parent.mkdir(exist_ok=True, parents=True)
+        built_manifest_path(output_path).unlink(missing_ok=True)
 
         rmtree(
             output_path,
@@ -209,36 +260,15 @@ class Copier:
             answers,
             build_tool,
         )
+        # Taken before the fix commands change the project.
+        manifest = make_manifest(output_path)
 
-        if copied.build_tool == BuildTool.GNU_MAKE:
-            configure_commands = """
-make configure
-make validate-fix
-"""
-        elif copied.build_tool == BuildTool.GO_TASK:
-            configure_commands = """
-task configure
-task validate:fix
-"""
-        elif copied.build_tool == BuildTool.POE:
-            configure_commands = """
-poetry install
-poetry run poe validate-fix
-"""
         try:
-            subprocess.run(
-                cwd=copied.output_path,
-                env=ESCAPED_ENV,
-                check=True,
-                args=[
-                    "bash",
-                    "-c",
-                    f"""
-    set -x
-    set -eo pipefail
-    # env | sort
-    {configure_commands}
-    """,
+            run_commands(
+                copied.output_path,
+                [
+                    *INSTALL_COMMANDS[copied.build_tool],
+                    *FIX_COMMANDS[copied.build_tool],
                 ],
             )
         except Exception:
@@ -253,9 +283,138 @@ poetry run poe validate-fix
                 ),
             )
             raise
+        built_manifest_path(output_path).write_text(json.dumps(manifest, indent=2))
+        return copied
+
+    def _copy_incremental(
+        self, template_path: Path, data: Dict[str, Any]
+    ) -> CopyResult:
+        """
+        Copies into a configured project that is keyed by the rendered
+        dependency relevant files only. If such a project already exists the
+        changed files are overlaid onto it, and its venv is kept.
+        """
+        with tempfile.TemporaryDirectory(prefix="rendered-") as rendered_dir:
+            rendered_path = Path(rendered_dir)
+            render(template_path, data, rendered_path)
+            manifest = make_manifest(rendered_path)
+            dependency_manifest = {
+                path: entry
+                for path, entry in manifest.items()
+                if is_dependency_relevant(path)
+            }
+            key_hash = hash_object(
+                (
+                    f"{template_path}",
+                    frozendict(data),
+                    json.dumps(dependency_manifest, sort_keys=True),
+                )
+            )
+            output_path = self.base_path / f"configured-{key_hash}" / "project"
+            manifest_path = built_manifest_path(output_path)
+            logging.info(
+                "output_path = %s, manifest_path = %s", output_path, manifest_path
+            )
+
+            answers_file = rendered_path / ".copier-answers.yml"
+            with answers_file.open("r") as _io:
+                answers = yaml.safe_load(_io)
+            build_tool = BuildTool(answers["build_tool"])
+            copied = CopyResult(
+                template_path,
+                key_hash,
+                frozendict(data),
+                output_path,
+                answers,
+                build_tool,
+            )
+
+            try:
+                if manifest_path.exists():
+                    previous = json.loads(manifest_path.read_text())
+                    changed = changed_paths(previous, manifest)
+                    logging.info("overlaying changed paths %s", sorted(changed))
+                    overlay(rendered_path, output_path, changed)
+                    if changed:
+                        run_commands(output_path, FIX_COMMANDS[build_tool])
+                else:
+                    rmtree(output_path, ignore_errors=True)
+                    # Copied like a full rebuild, so that git is set up the
+                    # same way. Overlaid changes are left uncommitted, as are
+                    # the changes from the fix commands.
+                    run_copy(
+                        f"{template_path}",
+                        f"{output_path}",
+                        data=data,
+                        defaults=True,
+                        vcs_ref="HEAD",
+                    )
+                    run_commands(
+                        output_path,
+                        [*INSTALL_COMMANDS[build_tool], *FIX_COMMANDS[build_tool]],
+                    )
+            except Exception:
+                rmtree(output_path.parent, ignore_errors=True)
+                raise
+            manifest_path.write_text(json.dumps(manifest, indent=2))
         return copied
 
 
+def built_manifest_path(output_path: Path) -> Path:
+    """
+    The render manifest that the copied project at ``output_path`` was last
+    built from, which is older than the template when TEST_RAPID reuses it.
+    """
+    return output_path.parent / f"{output_path.name}-manifest.json"
+
+
+def overlay(source_path: Path, target_path: Path, paths: Set[str]) -> None:
+    """
+    Makes ``paths`` in ``target_path`` the same as in ``source_path``, and
+    copies the files left out of manifests.
+    """
+    for path in sorted(paths | MANIFEST_EXCLUDE_FILES):
+        source_file_path = source_path / path
+        target_file_path = target_path / path
+        if source_file_path.exists():
+            target_file_path.parent.mkdir(parents=True, exist_ok=True)
+            copy2(source_file_path, target_file_path)
+        elif target_file_path.exists():
+            target_file_path.unlink()
+
+
+INSTALL_COMMANDS: Dict[BuildTool, List[str]] = {
+    BuildTool.GNU_MAKE: ["make configure"],
+    BuildTool.GO_TASK: ["task configure"],
+    BuildTool.POE: ["poetry install"],
+}
+
+FIX_COMMANDS: Dict[BuildTool, List[str]] = {
+    BuildTool.GNU_MAKE: ["make validate-fix"],
+    BuildTool.GO_TASK: ["task validate:fix"],
+    BuildTool.POE: ["poetry run poe validate-fix"],
+}
+
+
+def run_commands(cwd: Path, commands: List[str]) -> None:
+    configure_commands = "\n".join(commands)
+    subprocess.run(
+        cwd=cwd,
+        env=ESCAPED_ENV,
+        check=True,
+        args=[
+            "bash",
+            "-c",
+            f"""
+    set -x
+    set -eo pipefail
+    # env | sort
+    {configure_commands}
+    """,
+        ],
+    )
+
+
 COPIER = Copier()
 
 
@@ -288,6 +447,586 @@ WORKFLOW_ACTION_FACTORIES: Dict[
 #     if build_tool == BuildTool.GNU_MAKE:
 
 
+VENV_WORKER_SCRIPT_PATH = PROJECT_PATH / "_scripts" / "venv_worker.py"
+
+
+@dataclass(frozen=True)
+class WorkerCommand:
+    name: str
+    args: Tuple[str, ...] = ()
+    kind: str = "entry_point"
+
+
+@dataclass(frozen=True)
+class WorkerResult:
+    command: WorkerCommand
+    returncode: int
+    stdout: str
+    stderr: str
+    duration: float
+
+
+# Seconds to wait for a response from a worker before killing it.
+WORKER_TIMEOUT = 900.0
+
+
+class VenvWorker:
+    """
+    Client for ``_scripts/venv_worker.py`` running inside the venv of a copied
+    project.
+    """
+
+    def __init__(self, copied: CopyResult, timeout: float = WORKER_TIMEOUT) -> None:
+        self.copied = copied
+        self.timeout = timeout
+        self._next_id = 0
+        # The worker gets its own process group so that it can be killed along
+        # with the command it is running.
+        self._process = subprocess.Popen(
+            cwd=copied.output_path,
+            env=ESCAPED_ENV,
+            args=["poetry", "run", "python", f"{VENV_WORKER_SCRIPT_PATH}"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            start_new_session=True,
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._process.poll() is None
+
+    def _kill(self) -> None:
+        with contextlib.suppress(ProcessLookupError):
+            os.killpg(self._process.pid, signal.SIGKILL)
+        self._process.wait()
+
+    def _request(self, op: str, **kwargs: Any) -> Dict[str, Any]:
+        assert self._process.stdin is not None
+        assert self._process.stdout is not None
+        self._next_id += 1
+        request_id = self._next_id
+        self._process.stdin.write(
+            json.dumps({"op": op, "id": request_id, **kwargs}) + "\n"
+        )
+        self._process.stdin.flush()
+        # Responses are single lines written after each request, so nothing
+        # is left buffered in stdout between requests.
+        readable, _, _ = select.select([self._process.stdout], [], [], self.timeout)
+        if not readable:
+            self._kill()
+            raise TimeoutError(
+                f"worker for {self.copied.output_path} did not respond to {op}"
+                f" within {self.timeout}s"
+            )
+        line = self._process.stdout.readline()
+        if not line:
+            raise RuntimeError(
+                f"worker for {self.copied.output_path} exited with {self._process.poll()}"
+            )
+        response = json.loads(line)
+        assert isinstance(response, dict)
+        assert response["id"] == request_id
+        if response["error"] is not None:
+            raise RuntimeError(f"worker error: {response['error']}")
+        return response
+
+    def preload(self, modules: Iterable[str]) -> None:
+        response = self._request("preload", modules=list(modules))
+        logging.info(
+            "preload duration = %s, failures = %s",
+            response["duration"],
+            response["stderr"],
+        )
+
+    def run(self, command: WorkerCommand) -> WorkerResult:
+        if command.kind == "shell":
+            return self._run_shell(command)
+        response = self._request(
+            "run",
+            kind=command.kind,
+            name=command.name,
+            args=expand_globs(command.args, self.copied.output_path),
+            cwd=f"{self.copied.output_path}",
+        )
+        return WorkerResult(
+            command,
+            response["returncode"],
+            response["stdout"],
+            response["stderr"],
+            response["duration"],
+        )
+
+    def _run_shell(self, command: WorkerCommand) -> WorkerResult:
+        # Pipelines cannot run in the worker, so they run in a shell as the
+        # build tools do.
+        started = time.perf_counter()
+        completed = subprocess.run(
+            ["bash", "-c", f"set -eo pipefail\n{command.name}"],
+            cwd=self.copied.output_path,
+            env=ESCAPED_ENV,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            timeout=self.timeout,
+        )
+        return WorkerResult(
+            command,
+            completed.returncode,
+            completed.stdout,
+            completed.stderr,
+            time.perf_counter() - started,
+        )
+
+    def close(self) -> None:
+        if self._process.poll() is None:
+            assert self._process.stdin is not None
+            try:
+                self._process.stdin.write(json.dumps({"op": "shutdown"}) + "\n")
+                self._process.stdin.close()
+                self._process.wait(timeout=30)
+            except (OSError, subprocess.TimeoutExpired):
+                self._kill()
+
+
+WORKER_PRELOAD_MODULES = (
+    "pytest",
+    "mypy.main",
+    "black",
+    "isort.main",
+    "flake8.main.cli",
+    "codespell_lib",
+)
+
+
+class VenvWorkers:
+    def __init__(self) -> None:
+        self._workers: Dict[Path, VenvWorker] = {}
+
+    def get(self, copied: CopyResult) -> VenvWorker:
+        worker = self._workers.get(copied.output_path)
+        if worker is None or not worker.running:
+            worker = self._workers[copied.output_path] = VenvWorker(copied)
+            worker.preload(
+                (
+                    f'{copied.answers["python_package_fqname"]}.cli',
+                    *WORKER_PRELOAD_MODULES,
+                )
+            )
+        return worker
+
+    def close(self) -> None:
+        for worker in self._workers.values():
+            worker.close()
+        self._workers.clear()
+
+
+def expand_globs(args: Iterable[str], cwd: Path) -> List[str]:
+    """
+    Expands arguments with wildcards against ``cwd`` as a shell would.
+    """
+    result: List[str] = []
+    for arg in args:
+        matches = sorted(path.name for path in cwd.glob(arg)) if "*" in arg else []
+        result.extend(matches or [arg])
+    return result
+
+
+PY_SOURCE = ("src", "tests")
+MYPY_ARGS = ("--show-error-context", "--show-error-codes")
+PYTEST_ARGS = ("-n", "auto", "--durations=20")
+PIP_AUDIT_COMMAND = WorkerCommand(
+    "poetry export --without-hashes --with dev --format requirements.txt"
+    " | poetry run pip-audit --requirement /dev/stdin --no-deps --strict --desc on",
+    kind="shell",
+)
+
+# The checks that the validate target of each build tool runs, for the worker
+# path. test_validate_worker_commands fails if these name other tools than
+# the build tool files do.
+VALIDATE_WORKER_COMMANDS: Dict[BuildTool, List[WorkerCommand]] = {
+    BuildTool.GNU_MAKE: [
+        WorkerCommand("mypy", MYPY_ARGS),
+        WorkerCommand("codespell", (*PY_SOURCE, "*.md")),
+        WorkerCommand("isort", ("--check", "--diff", *PY_SOURCE)),
+        WorkerCommand("black", ("--check", "--diff", *PY_SOURCE)),
+        WorkerCommand("flake8", PY_SOURCE),
+        PIP_AUDIT_COMMAND,
+        WorkerCommand(
+            "pytest", (*PYTEST_ARGS, "--cov-report", "term", "--cov-report", "xml")
+        ),
+    ],
+    BuildTool.GO_TASK: [
+        WorkerCommand("mypy", MYPY_ARGS),
+        WorkerCommand("codespell", PY_SOURCE),
+        WorkerCommand("isort", ("--check", "--diff", *PY_SOURCE)),
+        WorkerCommand("black", ("--check", "--diff", *PY_SOURCE)),
+        WorkerCommand("flake8", PY_SOURCE),
+        PIP_AUDIT_COMMAND,
+        WorkerCommand("pytest", PYTEST_ARGS),
+    ],
+    BuildTool.POE: [
+        WorkerCommand("mypy", (*MYPY_ARGS, *PY_SOURCE)),
+        WorkerCommand("isort", ("--check", "--diff", *PY_SOURCE)),
+        WorkerCommand("black", ("--check", "--diff", *PY_SOURCE)),
+        WorkerCommand("flake8", PY_SOURCE),
+        PIP_AUDIT_COMMAND,
+        WorkerCommand("pytest", PYTEST_ARGS),
+    ],
+}
+
+WORKFLOW_ACTION_WORKER_COMMANDS: Dict[
+    WorkflowAction, Callable[[CopyResult], List[WorkerCommand]]
+] = {
+    WorkflowAction.VALIDATE: lambda result: VALIDATE_WORKER_COMMANDS[result.build_tool],
+    WorkflowAction.CLI: lambda result: [
+        WorkerCommand(result.answers["cli_name"], ("-vvvv", "sub", "leaf")),
+    ],
+}
+
+
+@pytest.fixture(scope="session")
+def venv_workers() -> Generator[VenvWorkers, None, None]:
+    workers = VenvWorkers()
+    yield workers
+    workers.close()
+
+
+GOLDEN_MANIFESTS_PATH = TEST_DATA_PATH / "manifests"
+
+# Files that are different for every render and that are left out of
+# manifests.
+MANIFEST_EXCLUDE_DIRS = {".git"}
+MANIFEST_EXCLUDE_FILES = {".copier-answers.yml", ".copier-answers.yml.conf"}
+
+# Files that affect the dependencies or tooling of a generated project, if
+# none of these change the configure/validate tier can be skipped.
+DEPENDENCY_FILE_NAMES = {
+    "pyproject.toml",
+    "poetry.toml",
+    "setup.cfg",
+    "requirements-boot.in",
+    "Makefile",
+    "Taskfile.yml",
+}
+
+Manifest = Dict[str, Dict[str, str]]
+
+
+# Directories and files that are created when configuring and validating a
+# project, and that are left out when comparing configured projects.
+PROJECT_EXCLUDE_DIRS = {
+    ".git",
+    ".venv",
+    ".mypy_cache",
+    ".pytest_cache",
+    "__pycache__",
+    "var",
+}
+PROJECT_EXCLUDE_FILES = {"poetry.lock", ".coverage", "coverage.xml"}
+
+
+def make_manifest(
+    root: Path,
+    exclude_dirs: Set[str] = MANIFEST_EXCLUDE_DIRS,
+    exclude_files: Set[str] = MANIFEST_EXCLUDE_FILES,
+) -> Manifest:
+    """
+    Makes a manifest of all files under ``root`` with their mode and content
+    digest. Only the executable bit of the mode is recorded as the rest
+    depends on the umask.
+    """
+    manifest: Manifest = {}
+    for _dirpath, dirnames, filenames in os.walk(root):
+        dirpath = Path(_dirpath)
+        dirnames[:] = sorted(
+            dirname for dirname in dirnames if dirname not in exclude_dirs
+        )
+        for filename in sorted(filenames):
+            file_path = dirpath / filename
+            relative_path = file_path.relative_to(root).as_posix()
+            if relative_path in exclude_files:
+                continue
+            executable = file_path.stat().st_mode & stat.S_IXUSR
+            manifest[relative_path] = {
+                "mode": "0o755" if executable else "0o644",
+                "sha256": hashlib.sha256(file_path.read_bytes()).hexdigest(),
+            }
+    return dict(sorted(manifest.items()))
+
+
+def render(template_path: Path, data: Dict[str, Any], output_path: Path) -> None:
+    """
+    Renders the template without initializing git, which manifests leave out.
+    """
+    run_copy(
+        f"{template_path}",
+        f"{output_path}",
+        data={**data, "git_init": False},
+        defaults=True,
+        vcs_ref="HEAD",
+        quiet=True,
+    )
+
+
+_RENDERED_MANIFESTS: Dict[frozendict[str, Any], Manifest] = {}
+
+
+def render_manifest(data: Dict[str, Any]) -> Manifest:
+    key = frozendict(data)
+    if key not in _RENDERED_MANIFESTS:
+        with tempfile.TemporaryDirectory(prefix="rendered-") as output_dir:
+            render(PROJECT_PATH, data, Path(output_dir))
+            _RENDERED_MANIFESTS[key] = make_manifest(Path(output_dir))
+    return _RENDERED_MANIFESTS[key]
+
+
+def golden_manifest_path(config_name: str) -> Path:
+    return GOLDEN_MANIFESTS_PATH / f"{config_name}.json"
+
+
+def load_golden_manifest(config_name: str) -> Optional[Manifest]:
+    path = golden_manifest_path(config_name)
+    if not path.exists():
+        return None
+    manifest = json.loads(path.read_text())
+    assert isinstance(manifest, dict)
+    return manifest
+
+
+def changed_paths(expected: Optional[Manifest], actual: Manifest) -> Set[str]:
+    if expected is None:
+        return set(actual)
+    return {
+        path
+        for path in set(expected) | set(actual)
+        if expected.get(path) != actual.get(path)
+    }
+
+
+def format_manifest_diff(
+    expected: Optional[Manifest], actual: Manifest, name: str
+) -> str:
+    def lines(manifest: Optional[Manifest]) -> List[str]:
+        return [
+            f"{path} {entry['mode']} {entry['sha256']}\n"
+            for path, entry in (manifest or {}).items()
+        ]
+
+    return "".join(
+        difflib.unified_diff(
+            lines(expected),
+            lines(actual),
+            fromfile=f"golden/{name}",
+            tofile=f"rendered/{name}",
+        )
+    )
+
+
+def is_dependency_relevant(path: str) -> bool:
+    return PurePosixPath(path).name in DEPENDENCY_FILE_NAMES
+
+
+def validated_manifest_path(config_name: str, workflow_action: WorkflowAction) -> Path:
+    """
+    The render manifest of a case as of its last successful run, which is kept
+    with the copied projects and not with the golden manifests as those are
+    updated along with the template.
+    """
+    return (
+        COPIER.base_path
+        / "validated-manifests"
+        / f"{config_name}-{workflow_action.value}.json"
+    )
+
+
+def record_validated_manifest(path: Path, copied: CopyResult) -> None:
+    """
+    Records the manifest that the copied project was built from as validated,
+    if tiering is enabled. A project that predates built manifests is not
+    recorded, so its cases keep running.
+    """
+    if not TEST_TIERED:
+        return
+    manifest_path = built_manifest_path(copied.output_path)
+    if not manifest_path.exists():
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    copy2(manifest_path, path)
+
+
+def make_render_cases() -> Generator[ParameterSet, None, None]:
+    for answers_path in sorted((TEST_DATA_PATH / "copier-answers").glob("*.yaml")):
+        config_name = answers_path.stem
+        yield pytest.param(config_name, id=config_name)
+
+
+@pytest.mark.parametrize(["config_name"], make_render_cases())
+def test_render_manifest(config_name: str, tmp_path: Path) -> None:
+    """
+    Renders the template and compares the result against a golden manifest.
+    Run with ``TEST_UPDATE_GOLDEN=true`` to update golden manifests.
+    """
+    render(PROJECT_PATH, load_answers(config_name), tmp_path)
+    actual = make_manifest(tmp_path)
+    if TEST_UPDATE_GOLDEN:
+        GOLDEN_MANIFESTS_PATH.mkdir(parents=True, exist_ok=True)
+        golden_manifest_path(config_name).write_text(
+            json.dumps(actual, indent=2) + "\n"
+        )
+        return
+    expected = load_golden_manifest(config_name)
+    changed = changed_paths(expected, actual)
+    if changed:
+        sys.stderr.write(format_manifest_diff(expected, actual, config_name))
+        sys.stderr.write(f"rendered output for inspection is in {tmp_path}\n")
+    assert (
+        not changed
+    ), f"render manifest for {config_name} differs from golden for {sorted(changed)}"
+
+
+@pytest.mark.skipif(not TEST_INCREMENTAL, reason="TEST_INCREMENTAL is not enabled")
+def test_incremental_copy(tmp_path: Path) -> None:
+    """
+    Changes a file that is not dependency relevant in a copy of the template
+    and checks that the configured project is reused and matches a full
+    rebuild without incremental copies.
+    """
+    template_path = tmp_path / "template"
+    copytree(
+        PROJECT_PATH,
+        template_path,
+        symlinks=True,
+        ignore=ignore_patterns(*PROJECT_EXCLUDE_DIRS),
+    )
+
+    def commit() -> None:
+        subprocess.run(
+            cwd=template_path,
+            check=True,
+            args=[
+                "bash",
+                "-c",
+                """
+    set -eo pipefail
+    git init -q
+    git add -A
+    git -c user.name=test -c user.email=test@example.com commit -q -m test
+    """,
+            ],
+        )
+
+    commit()
+    copier = Copier(base_path=tmp_path / "incremental", incremental=True)
+    data = load_answers("minimal")
+    first = copier.copy(template_path, data)
+    readme_path = template_path / "template" / "README.md"
+    readme_path.write_text(readme_path.read_text() + "\nchanged\n")
+    commit()
+    second = copier.copy(template_path, data)
+    assert second.output_path == first.output_path
+
+    full = Copier(base_path=tmp_path / "full", incremental=False).copy(
+        template_path, data
+    )
+    assert (second.output_path / ".git").exists() == (
+        full.output_path / ".git"
+    ).exists()
+    exclude_files = MANIFEST_EXCLUDE_FILES | PROJECT_EXCLUDE_FILES
+    incremental_manifest = make_manifest(
+        second.output_path, PROJECT_EXCLUDE_DIRS, exclude_files
+    )
+    full_manifest = make_manifest(full.output_path, PROJECT_EXCLUDE_DIRS, exclude_files)
+    assert "changed" in (second.output_path / "README.md").read_text()
+    assert changed_paths(full_manifest, incremental_manifest) == set()
+
+
+VALIDATE_TOOL_NAMES = (
+    "mypy",
+    "codespell",
+    "isort",
+    "black",
+    "flake8",
+    "pip-audit",
+    "pytest",
+)
+
+
+def validate_tool_names(commands: Iterable[str]) -> Set[str]:
+    text = "\n".join(commands).replace("pip_audit", "pip-audit")
+    return {
+        name
+        for name in VALIDATE_TOOL_NAMES
+        if re.search(rf"(?<![\w-]){re.escape(name)}(?![\w-])", text)
+    }
+
+
+def build_tool_validate_commands(
+    project_path: Path, build_tool: BuildTool
+) -> List[str]:
+    """
+    Returns the commands that the validate target of the build tool runs in
+    the project at ``project_path``, without running them.
+    """
+    if build_tool == BuildTool.GNU_MAKE:
+        return subprocess.run(
+            ["make", "--dry-run", "validate"],
+            cwd=project_path,
+            stdout=subprocess.PIPE,
+            text=True,
+            check=True,
+        ).stdout.splitlines()
+    if build_tool == BuildTool.GO_TASK:
+        tasks = yaml.safe_load((project_path / "Taskfile.yml").read_text())["tasks"]
+
+        def task_commands(name: str) -> Generator[str, None, None]:
+            for command in tasks[name].get("cmds", []):
+                if isinstance(command, dict):
+                    yield from task_commands(command["task"])
+                else:
+                    yield command
+
+        return list(task_commands("validate"))
+    pyproject = (project_path / "pyproject.toml").read_text()
+
+    def poe_commands(name: str) -> Generator[str, None, None]:
+        match = re.search(
+            rf"^\[tool\.poe\.tasks\.{re.escape(name)}\]\n(.*?)(?=^\[|\Z)",
+            pyproject,
+            re.MULTILINE | re.DOTALL,
+        )
+        assert match is not None, f"no poe task {name}"
+        for line in match.group(1).splitlines():
+            ref = re.search(r'\bref = "([^"]+)"', line)
+            command = re.search(r'\b(?:cmd|shell) = "(.*)"', line)
+            if ref is not None:
+                yield from poe_commands(ref.group(1))
+            elif command is not None:
+                yield command.group(1)
+
+    return list(poe_commands("validate"))
+
+
+@pytest.mark.parametrize(["config_name"], make_render_cases())
+def test_validate_worker_commands(config_name: str, tmp_path: Path) -> None:
+    """
+    The worker path runs the same checks as the validate target of the build
+    tool, so that TEST_WORKER does not skip any of them.
+    """
+    data = load_answers(config_name)
+    render(PROJECT_PATH, data, tmp_path)
+    answers = yaml.safe_load((tmp_path / ".copier-answers.yml").read_text())
+    build_tool = BuildTool(answers["build_tool"])
+    if build_tool == BuildTool.GNU_MAKE and which("make") is None:
+        pytest.skip("make is not installed")
+    expected = validate_tool_names(build_tool_validate_commands(tmp_path, build_tool))
+    actual = validate_tool_names(
+        " ".join((command.name, *command.args))
+        for command in VALIDATE_WORKER_COMMANDS[build_tool]
+    )
+    assert actual == expected
+
+
 def make_copied_cmd_cases() -> Generator[ParameterSet, None, None]:
     config_names = {"minimal", "basic", "poe_minimal", "minimal_typer"}
     for config_name, workflow_action in itertools.product(
@@ -297,15 +1036,29 @@ def make_copied_cmd_cases() -> Generator[ParameterSet, None, None]:
         data = load_answers(config_name)
         if config_name == "everything":
             data["init_git"] = "y"
-        yield pytest.param(data, workflow_action, id=f"{config_name}-{workflow_action}")
+        yield pytest.param(
+            config_name, data, workflow_action, id=f"{config_name}-{workflow_action}"
+        )
 
 
-@pytest.mark.parametrize(["data", "workflow_action"], make_copied_cmd_cases())
+@pytest.mark.parametrize(
+    ["config_name", "data", "workflow_action"], make_copied_cmd_cases()
+)
 def test_copied_cmd(
+    config_name: str,
     data: Dict[str, Any],
     workflow_action: WorkflowAction,
     tmp_path: Path,
+    venv_workers: VenvWorkers,
 ) -> None:
+    validated_path = validated_manifest_path(config_name, workflow_action)
+    if TEST_TIERED and validated_path.exists():
+        changed = changed_paths(
+            json.loads(validated_path.read_text()), render_manifest(data)
+        )
+        if not any(is_dependency_relevant(path) for path in changed):
+            pytest.skip("no dependency relevant changes since last validated")
+
     result = COPIER.copy(template_path=PROJECT_PATH, data=data)
     # result = run_copy(f"{PROJECT_PATH}", f"{tmp_path}", data=data, defaults=True, vcs_ref="HEAD")
     # output_path = tmp_path
@@ -329,6 +1082,22 @@ def test_copied_cmd(
     #     ],
     # )
 
+    if TEST_WORKER:
+        worker = venv_workers.get(result)
+        for command in WORKFLOW_ACTION_WORKER_COMMANDS[workflow_action](result):
+            worker_result = worker.run(command)
+            logging.info(
+                "command = %s, returncode = %s, duration = %s",
+                command,
+                worker_result.returncode,
+                worker_result.duration,
+            )
+            sys.stderr.write(worker_result.stdout)
+            sys.stderr.write(worker_result.stderr)
+            assert worker_result.returncode == 0, f"{command} failed"
+        record_validated_manifest(validated_path, result)
+        return
+
     subprocess.run(
         cwd=output_path,
         env=ESCAPED_ENV,
@@ -343,3 +1112,4 @@ set -x
     """,
         ],
     )
+    record_validated_manifest(validated_path, result)
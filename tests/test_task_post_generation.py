@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from _scripts.task_post_generation import (
+    REPORT_FORMAT_VERSION,
+    CopierAnswers,
+    Report,
+    apply,
+)
+
+SCRIPT_PATH = Path(__file__)
+PROJECT_PATH = SCRIPT_PATH.parent.parent
+POST_GENERATION_PATH = PROJECT_PATH / "_scripts" / "task_post_generation.py"
+
+ANSWERS = CopierAnswers.from_mapping(
+    {
+        "python_package_fqname": "example.project.minimal",
+        "variant": "minimal",
+        "git_init": False,
+        "git_commit": False,
+    }
+)
+
+
+def list_files(path: Path) -> List[str]:
+    return sorted(f"{item.relative_to(path)}" for item in path.rglob("*"))
+
+
+def phase_counts(report: Report) -> Dict[str, Any]:
+    return {
+        event.phase: (event.files, event.directories, event.bytes, event.skipped)
+        for event in report.events
+    }
+
+
+def test_dry_run(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    A dry run changes nothing and reports the same counts as a real run.
+    """
+    monkeypatch.chdir(tmp_path)
+    dry_report = Report(answers=ANSWERS, dry_run=True)
+    apply(ANSWERS, dry_report, dry_run=True)
+    assert list_files(tmp_path) == []
+
+    report = Report(answers=ANSWERS, dry_run=False)
+    apply(ANSWERS, report)
+    assert phase_counts(dry_report) == phase_counts(report)
+    namespace_path = tmp_path / "src" / "example" / "project" / "minimal"
+    assert (namespace_path / "cli.py").exists()
+    counts = phase_counts(report)
+    assert counts["mkdir"][1] == 4
+    copied = [path for path in namespace_path.rglob("*") if path.is_file()]
+    assert counts["copy"][0] == len(copied)
+    assert counts["copy"][2] == sum(path.stat().st_size for path in copied)
+    assert counts["git_init"][3] and counts["git_commit"][3]
+
+    # Nothing is copied again when the package files are up to date.
+    report = Report(answers=ANSWERS, dry_run=False)
+    apply(ANSWERS, report)
+    assert phase_counts(report)["copy"][:3] == (0, 0, 0)
+    assert phase_counts(report)["mkdir"][:3] == (0, 0, 0)
+
+
+def test_report(tmp_path: Path) -> None:
+    answers_path = tmp_path / ".copier-answers.yml"
+    answers_path.write_text(
+        json.dumps(
+            {
+                "python_package_fqname": ANSWERS.python_package_fqname,
+                "variant": ANSWERS.variant.value,
+                "git_init": True,
+                "git_commit": True,
+            }
+        )
+    )
+    (tmp_path / ".gitignore").write_text("*.log\n")
+    (tmp_path / "debug.log").write_text("ignored\n")
+    report_path = tmp_path / "var" / "report.json"
+    subprocess.run(
+        [
+            sys.executable,
+            f"{POST_GENERATION_PATH}",
+            "--copier-conf",
+            json.dumps({"answers_file": f"{answers_path}"}),
+            "--report",
+            f"{report_path}",
+            "--dry-run",
+        ],
+        cwd=tmp_path,
+        check=True,
+    )
+    assert not (tmp_path / "src").exists()
+    assert not (tmp_path / ".git").exists()
+    report = json.loads(report_path.read_text())
+    assert report["format_version"] == REPORT_FORMAT_VERSION
+    assert report["status"] == "ok"
+    assert report["dry_run"] is True
+    assert report["answers"]["variant"] == "minimal"
+    events = report["events"]
+    assert [event["phase"] for event in events] == [
+        "mkdir",
+        "copy",
+        "git_init",
+        "git_commit",
+    ]
+    for event in events:
+        assert set(event) == {
+            "phase",
+            "start",
+            "end",
+            "duration",
+            "files",
+            "directories",
+            "bytes",
+            "skipped",
+        }
+        assert event["start"] <= event["end"]
+        assert event["skipped"] is False
+    # The answers file and .gitignore are committed with the package files.
+    assert events[1]["files"] > 0
+    assert events[-1]["files"] == 2 + events[1]["files"]
+
+
+def test_git_commit(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    The git_commit phase counts the files that are committed, without the
+    ignored ones.
+    """
+    for name in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{name}_NAME", "test")
+        monkeypatch.setenv(f"GIT_{name}_EMAIL", "test@example.com")
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".gitignore").write_text("*.log\n")
+    (tmp_path / "debug.log").write_text("ignored\n")
+    answers = dataclasses.replace(ANSWERS, git_init=True, git_commit=True)
+    dry_report = Report(answers=answers, dry_run=True)
+    apply(answers, dry_report, dry_run=True)
+    report = Report(answers=answers, dry_run=False)
+    apply(answers, report)
+    committed = subprocess.run(
+        ["git", "ls-files"],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    ).stdout.split()
+    assert "debug.log" not in committed
+    assert phase_counts(dry_report) == phase_counts(report)
+    assert phase_counts(report)["git_commit"][0] == len(committed)